@@ -0,0 +1,174 @@
+"""Akurasi prediksi: selaraskan Aktual vs Perkiraan per bulan, lalu hitung MAPE, bias, dan coverage interval.
+
+Bulan yang hanya punya nilai Fitted (in-sample) ikut dihitung tapi ditandai lewat kolom `sumber`;
+angkanya cenderung lebih bagus daripada akurasi perkiraan sungguhan.
+Semua perhitungan memakai array NumPy (bincount / cumsum), tanpa loop per baris.
+"""
+import numpy as np
+import pandas as pd
+
+# urutan = prioritas; Perkiraan (out-of-sample) menang atas Fitted (in-sample) di bulan yang sama
+FORECAST_JENIS = ("Perkiraan", "Fitted")
+
+
+def month_index(tanggal: pd.Series) -> np.ndarray:
+    # jumlah bulan sejak 1970-01 (int), dipakai sebagai kunci penyelarasan
+    return tanggal.to_numpy(dtype="datetime64[ns]").astype("datetime64[M]").astype(np.int64)
+
+
+def _group_nanmean(keys: np.ndarray, values: np.ndarray):
+    uniq, inv = np.unique(keys, return_inverse=True)
+    ok = ~np.isnan(values)
+    sums = np.bincount(inv, weights=np.where(ok, values, 0.0), minlength=len(uniq))
+    cnt = np.bincount(inv, weights=ok.astype(float), minlength=len(uniq))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return uniq, np.where(cnt > 0, sums / cnt, np.nan)
+
+
+def _monthly(tidy: pd.DataFrame, jenis: str):
+    d = tidy[tidy["jenis"] == jenis]
+    keys = month_index(d["tanggal"])
+    out = {}
+    for col in ["nilai", "min", "max"]:
+        uniq, out[col] = _group_nanmean(keys, d[col].to_numpy(dtype=float))
+    return uniq, out
+
+
+def align_actual_forecast(tidy: pd.DataFrame) -> pd.DataFrame:
+    cols = ["bulan", "sumber", "aktual", "perkiraan", "min", "max"]
+    if tidy is None or tidy.empty:
+        return pd.DataFrame(columns=cols)
+
+    act_m, act = _monthly(tidy, "Aktual")
+
+    taken = np.array([], dtype=np.int64)
+    parts = []
+    for jenis in FORECAST_JENIS:
+        fc_m, fc = _monthly(tidy, jenis)
+        common, ia, ifc = np.intersect1d(act_m, fc_m, return_indices=True)
+        keep = ~np.isin(common, taken)
+        # nilai fitted 0 = masa warm-up model, bukan perkiraan sungguhan
+        keep &= (fc["nilai"][ifc] > 0) & (act["nilai"][ia] > 0)
+        ia, ifc, common = ia[keep], ifc[keep], common[keep]
+        taken = np.concatenate([taken, common])
+        parts.append(pd.DataFrame({
+            "bulan": common,
+            "sumber": jenis,
+            "aktual": act["nilai"][ia],
+            "perkiraan": fc["nilai"][ifc],
+            "min": fc["min"][ifc],
+            "max": fc["max"][ifc],
+        }))
+
+    out = pd.concat(parts, ignore_index=True).sort_values("bulan").reset_index(drop=True)
+    out["bulan"] = out["bulan"].to_numpy().astype("datetime64[M]").astype("datetime64[ns]")
+    return out[cols]
+
+
+def _error_arrays(aligned: pd.DataFrame):
+    act = aligned["aktual"].to_numpy(dtype=float)
+    pred = aligned["perkiraan"].to_numpy(dtype=float)
+    lo = aligned["min"].to_numpy(dtype=float)
+    hi = aligned["max"].to_numpy(dtype=float)
+    err = pred - act
+    ape = np.abs(err) / act * 100.0
+    has_int = np.isfinite(lo) & np.isfinite(hi)
+    covered = has_int & (act >= lo) & (act <= hi)
+    return act, err, ape, has_int, covered
+
+
+def _ratio(num, den):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(den > 0, num / np.where(den > 0, den, 1), np.nan)
+
+
+def _is_fitted(aligned: pd.DataFrame) -> np.ndarray:
+    return (aligned["sumber"] == "Fitted").to_numpy()
+
+
+def accuracy_summary(aligned: pd.DataFrame) -> dict:
+    if aligned.empty:
+        return {"n": 0, "n_fitted": 0, "mape": np.nan, "bias": np.nan, "bias_pct": np.nan,
+                "coverage": np.nan, "n_interval": 0}
+    act, err, ape, has_int, covered = _error_arrays(aligned)
+    n_int = int(has_int.sum())
+    return {
+        "n": int(len(act)),
+        "n_fitted": int(_is_fitted(aligned).sum()),
+        "mape": float(ape.mean()),
+        "bias": float(err.mean()),
+        "bias_pct": float(err.sum() / act.sum() * 100.0),
+        "coverage": float(covered.sum() / n_int * 100.0) if n_int else np.nan,
+        "n_interval": n_int,
+    }
+
+
+def accuracy_per_year(aligned: pd.DataFrame) -> pd.DataFrame:
+    cols = ["Tahun", "Sumber", "Jumlah_bulan", "MAPE_%", "Bias_kg", "Bias_%", "Coverage_%"]
+    if aligned.empty:
+        return pd.DataFrame(columns=cols)
+    act, err, ape, has_int, covered = _error_arrays(aligned)
+    years = aligned["bulan"].dt.year.to_numpy()
+    uniq, inv = np.unique(years, return_inverse=True)
+    n = np.bincount(inv).astype(float)
+    n_fitted = np.bincount(inv, weights=_is_fitted(aligned).astype(float))
+    n_int = np.bincount(inv, weights=has_int.astype(float))
+    sumber = np.where(n_fitted == 0, "Perkiraan", np.where(n_fitted == n, "Fitted", "Perkiraan + Fitted"))
+    return pd.DataFrame({
+        "Tahun": uniq,
+        "Sumber": sumber,
+        "Jumlah_bulan": n.astype(int),
+        "MAPE_%": np.bincount(inv, weights=ape) / n,
+        "Bias_kg": np.bincount(inv, weights=err) / n,
+        "Bias_%": np.bincount(inv, weights=err) / np.bincount(inv, weights=act) * 100.0,
+        "Coverage_%": _ratio(np.bincount(inv, weights=covered.astype(float)), n_int) * 100.0,
+    })[cols]
+
+
+def _rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    cs = np.concatenate([[0.0], np.cumsum(x, dtype=float)])
+    return cs[window:] - cs[:-window]
+
+
+def accuracy_rolling(aligned: pd.DataFrame, window: int = 12) -> pd.DataFrame:
+    cols = ["bulan", "Jumlah_bulan", "MAPE_%", "Bias_kg", "Coverage_%"]
+    window = int(window)
+    if aligned.empty or window < 1:
+        return pd.DataFrame(columns=cols)
+    act, err, ape, has_int, covered = _error_arrays(aligned)
+
+    # jendela = `window` bulan kalender, bukan `window` baris: bulan tanpa pasangan aktual/perkiraan
+    # tetap memakan tempat, jadi celah antar bulan tidak ikut digabung ke satu jendela
+    pos = month_index(aligned["bulan"])
+    pos = pos - pos[0]
+    span = int(pos[-1]) + 1
+    if span < window:
+        return pd.DataFrame(columns=cols)
+
+    def rolling(x):
+        return _rolling_sum(np.bincount(pos, weights=np.asarray(x, dtype=float), minlength=span), window)
+
+    n = rolling(np.ones(len(pos)))
+    n_int = rolling(has_int)
+    # nilai jendela dicatat di bulan terakhirnya, hanya untuk bulan yang memang punya data
+    present = np.zeros(span, dtype=bool)
+    present[pos] = True
+    end = present[window - 1:]
+    months = aligned["bulan"].to_numpy()[pos >= window - 1]
+    return pd.DataFrame({
+        "bulan": months,
+        "Jumlah_bulan": n[end].astype(int),
+        "MAPE_%": _ratio(rolling(ape), n)[end],
+        "Bias_kg": _ratio(rolling(err), n)[end],
+        "Coverage_%": (_ratio(rolling(covered), n_int) * 100.0)[end],
+    })[cols]
+
+
+def accuracy_report(tidy: pd.DataFrame, window: int = 12) -> dict:
+    aligned = align_actual_forecast(tidy)
+    return {
+        "aligned": aligned,
+        "summary": accuracy_summary(aligned),
+        "per_year": accuracy_per_year(aligned),
+        "rolling": accuracy_rolling(aligned, window),
+    }
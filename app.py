@@ -1,13 +1,60 @@
-import math
-import re
 import base64
+import functools
+import time
+from collections import deque
 from pathlib import Path
-from io import BytesIO
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 import altair as alt
 
+import metrics
+import static_report
+from accuracy import accuracy_report
+from ingest import (
+    UPLOAD_TYPES,
+    dataset_version,
+    parse_excel,
+    parse_workbook,
+    series_options,
+    series_view,
+)
+from profiling import (
+    HISTORY_SIZE,
+    Profiler,
+    cache_hit_rates,
+    payload_frame,
+    run_total,
+    section_percentiles,
+    waterfall_frame,
+)
+from report import (
+    ID_MONTH_NAMES,
+    UNIT_NAMES,
+    add_unit_columns,
+    apply_what_if,
+    convert_value_kg_to_unit,
+    fmt_dual_units,
+    fmt_int,
+    fmt_pct,
+    make_bar_month_chart,
+    make_line_month_chart,
+    make_rolling_accuracy_chart,
+    make_what_if_chart,
+    make_year_overlay_chart,
+    month_name_id,
+    month_table,
+    to_excel_bytes,
+    unit_column_labels,
+    unit_suffix,
+    view_unit_factors,
+    week_table,
+)
+from simulation import procurement_plan
+from rollup import LEVEL_LABELS, build_rollups, detect_granularity, growth_pct, year_month_matrix
+from units import BASE_UNIT
+
 # =========================================================
 # PAGE CONFIG
 # =========================================================
@@ -18,6 +65,44 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# =========================================================
+# PROFIL RERUN (Admin) - timer per bagian; kalau panel mati hampir tanpa biaya
+# =========================================================
+if "profile_history" not in st.session_state:
+    st.session_state.profile_history = deque(maxlen=HISTORY_SIZE)
+PROF = Profiler(bool(st.session_state.get("profiling", False)), st.session_state.profile_history)
+
+def profiled_cache(**cache_kwargs):
+    # st.cache_data + hitung panggilan (luar) dan miss (dalam: hanya jalan saat cache belum ada)
+    def decorator(fn):
+        @functools.wraps(fn)
+        def on_miss(*args, **kwargs):
+            PROF.cache_miss(fn.__name__)
+            metrics.cache_miss(fn.__name__)
+            return fn(*args, **kwargs)
+
+        cached = st.cache_data(**cache_kwargs)(on_miss)
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            PROF.cache_call(fn.__name__)
+            metrics.cache_call(fn.__name__)
+            return cached(*args, **kwargs)
+
+        call.clear = cached.clear
+        return call
+    return decorator
+
+def finish_rerun():
+    # dipanggil di akhir script dan sebelum st.stop(): latensi rerun per halaman -> metrik Prometheus
+    PROF.finish()
+    metrics.observe_rerun(st.session_state.get("page", "-"), time.perf_counter() - PROF.t0)
+    metrics.export_from_env()
+
+def stop_rerun():
+    finish_rerun()
+    st.stop()
+
 # =========================================================
 # LOGO (GAMBAR DARI REPO)
 # taruh file di: assets/logo.png
@@ -36,8 +121,9 @@ if LOGO_PATH.exists():
 # =========================================================
 # FULL CSS FINAL (BANANA + FIGMA + UPGRADE SELECTBOX + MENU)
 # =========================================================
-st.markdown(
-    """
+with PROF.section("html: css"):
+    st.markdown(
+        """
 <style>
 :root{
   --bg:#FBF7EF;
@@ -206,60 +292,9 @@ div[role="option"]:hover{
 /* Hide footer */
 footer{ visibility:hidden; }
 </style>
-    """,
-    unsafe_allow_html=True,
-)
-
-# =========================================================
-# MONTH HELPERS (ID)
-# =========================================================
-ID_MONTHS = {
-    "januari": 1, "jan": 1, "jan.": 1,
-    "februari": 2, "feb": 2,
-    "maret": 3, "mar": 3,
-    "april": 4, "apr": 4,
-    "mei": 5,
-    "juni": 6, "jun": 6,
-    "juli": 7, "jul": 7,
-    "agustus": 8, "agu": 8, "aug": 8,
-    "september": 9, "sep": 9,
-    "oktober": 10, "okt": 10,
-    "november": 11, "nov": 11,
-    "desember": 12, "des": 12, "dec": 12,
-}
-ID_MONTH_NAMES = {
-    1: "Januari", 2: "Februari", 3: "Maret", 4: "April",
-    5: "Mei", 6: "Juni", 7: "Juli", 8: "Agustus",
-    9: "September", 10: "Oktober", 11: "November", 12: "Desember",
-}
-def month_name_id(m: int) -> str:
-    return ID_MONTH_NAMES.get(int(m), str(m))
-
-def fmt_int(v: float) -> str:
-    try:
-        return f"{float(v):,.0f}"
-    except Exception:
-        return "—"
-
-# =========================================================
-# UNIT (Kg <-> Sisir) - patokan UMKM: 450 sisir = 250 kg
-# =========================================================
-SISIR_PER_KG = 450 / 250  # 1.8
-KG_PER_SISIR = 1 / SISIR_PER_KG
-
-def unit_suffix(unit_choice: str) -> str:
-    return "sisir" if unit_choice == "Sisir" else "kg"
-
-def convert_value_kg_to_unit(v_kg: float, unit_choice: str) -> float:
-    if v_kg is None or (isinstance(v_kg, float) and not math.isfinite(v_kg)):
-        return math.nan
-    if unit_choice == "Sisir":
-        return float(v_kg) * SISIR_PER_KG
-    return float(v_kg)
-
-def fmt_dual_units(v_kg: float) -> tuple[str, str]:
-    v_sisir = convert_value_kg_to_unit(v_kg, "Sisir")
-    return f"{fmt_int(v_kg)} kg", f"{fmt_int(v_sisir)} sisir"
+        """,
+        unsafe_allow_html=True,
+    )
 
 # =========================================================
 # UI HELPERS
@@ -288,295 +323,136 @@ def empty_state(title="Data belum tersedia", desc="Coba pilih tahun/bulan lain a
         unsafe_allow_html=True
     )
 
-def to_excel_bytes(df: pd.DataFrame, sheet_name="Data"):
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name=sheet_name)
-    return output.getvalue()
-
 # =========================================================
-# UNIVERSAL EXCEL PARSER
+# WHAT-IF (SKENARIO) - dihitung di agregat bulanan yang sudah di-cache
 # =========================================================
-def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df.columns = [
-        re.sub(r"\s+", "_", str(c).strip()).lower()
-        for c in df.columns
-    ]
-    return df
-
-def detect_date_column(df: pd.DataFrame):
-    for col in df.columns:
-        if pd.api.types.is_datetime64_any_dtype(df[col]):
-            if df[col].notna().sum() >= max(3, len(df) * 0.5):
-                return col, df[col]
-
-    date_keywords = ["tanggal", "tgl", "date", "waktu", "period", "periode", "bulan_tahun", "bulan-tahun", "bulan_thn"]
-    for col in df.columns:
-        if any(k in col for k in date_keywords):
-            parsed = pd.to_datetime(df[col], errors="coerce", dayfirst=True)
-            if parsed.notna().sum() >= max(3, len(df) * 0.5):
-                return col, parsed
-    return None, None
-
-def detect_year_month(df: pd.DataFrame):
-    year_col, month_col = None, None
-    for col in df.columns:
-        if any(k in col for k in ["tahun", "year", "thn", "th"]):
-            year_col = col
-        if any(k in col for k in ["bulan", "month", "bln", "mon"]):
-            month_col = col
-    return year_col, month_col
-
-def parse_year_month_to_date(df: pd.DataFrame, year_col: str, month_col: str) -> pd.Series:
-    y = pd.to_numeric(df[year_col], errors="coerce")
-    if (y < 100).sum() > 0 and (y < 100).sum() >= len(y) * 0.5:
-        y = y.apply(lambda v: 2000 + v if pd.notna(v) else v)
-
-    months_raw = df[month_col]
-    m = pd.to_numeric(months_raw, errors="coerce")
-    mask = m.isna() & months_raw.notna()
-    if mask.any():
-        def map_month(x):
-            if pd.isna(x): return math.nan
-            s = str(x).strip().lower()
-            s2 = re.sub(r"[^\w]+$", "", s)
-            return ID_MONTHS.get(s2, math.nan)
-        m[mask] = months_raw[mask].map(map_month)
-
-    return pd.to_datetime({"year": y, "month": m, "day": 1}, errors="coerce")
-
-def parse_excel_from_df(df_raw: pd.DataFrame):
-    df = normalize_columns(df_raw)
-
-    date_col, date_series = detect_date_column(df)
-    if date_series is None:
-        year_col, month_col = detect_year_month(df)
-        if year_col and month_col:
-            date_series = parse_year_month_to_date(df, year_col, month_col)
-            date_col = "tanggal"
-        else:
-            best_col, best_non_na, best_parsed = None, 0, None
-            for col in df.columns:
-                parsed = pd.to_datetime(df[col], errors="coerce", dayfirst=True)
-                non_na = parsed.notna().sum()
-                if non_na > best_non_na:
-                    best_non_na, best_col, best_parsed = non_na, col, parsed
-            if best_parsed is not None and best_non_na >= max(3, len(df) * 0.5):
-                date_col, date_series = best_col, best_parsed
-            else:
-                raise ValueError(
-                    "Tidak bisa mengenali kolom tanggal/bulan-tahun.\n"
-                    "Pastikan ada kolom tanggal, atau kolom bulan dan tahun."
-                )
-
-    df_base = df.copy()
-    df_base["tanggal"] = pd.to_datetime(date_series, errors="coerce")
-    df_base = df_base[df_base["tanggal"].notna()].copy().sort_values("tanggal")
-
-    numeric_cols = [
-        c for c in df_base.columns
-        if c not in ["tanggal", date_col] and pd.api.types.is_numeric_dtype(df_base[c])
-    ]
-
-    forecast_cols = [c for c in numeric_cols if any(k in c for k in ["mean", "forecast", "prediksi"])]
-    lower_cols = [c for c in numeric_cols if any(k in c for k in ["lower", "bawah", "min"])]
-    upper_cols = [c for c in numeric_cols if any(k in c for k in ["upper", "atas", "max"])]
-
-    actual_keywords = ["actual", "aktual", "realisasi", "pemakaian", "kebutuhan", "volume", "qty", "jumlah"]
-    actual_cols = [c for c in numeric_cols if any(k in c for k in actual_keywords)]
-
-    records = []
-
-    # Aktual (opsional)
-    for col in actual_cols:
-        for _, row in df_base.iterrows():
-            val = row[col]
-            if pd.isna(val):
-                continue
-            records.append({
-                "tanggal": row["tanggal"],
-                "jenis": "Aktual",
-                "nilai": float(val),
-                "min": math.nan,
-                "max": math.nan,
-            })
-
-    # Perkiraan (prediksi)
-    if forecast_cols:
-        mean_col = forecast_cols[0]
-        low_col = lower_cols[0] if lower_cols else None
-        up_col = upper_cols[0] if upper_cols else None
-
-        for _, row in df_base.iterrows():
-            mval = row[mean_col]
-            if pd.isna(mval):
-                continue
-            records.append({
-                "tanggal": row["tanggal"],
-                "jenis": "Perkiraan",
-                "nilai": float(mval),
-                "min": float(row[low_col]) if low_col and not pd.isna(row[low_col]) else math.nan,
-                "max": float(row[up_col]) if up_col and not pd.isna(row[up_col]) else math.nan,
-            })
-
-    # Fallback
-    if not records and numeric_cols:
-        col = numeric_cols[0]
-        for _, row in df_base.iterrows():
-            val = row[col]
-            if pd.isna(val):
-                continue
-            records.append({
-                "tanggal": row["tanggal"],
-                "jenis": "Perkiraan",
-                "nilai": float(val),
-                "min": math.nan,
-                "max": math.nan,
-            })
-
-    tidy = pd.DataFrame.from_records(records)
-    if tidy.empty:
-        raise ValueError("File terbaca, tapi tidak menemukan kolom angka untuk ditampilkan.")
-
-    tidy["tanggal"] = pd.to_datetime(tidy["tanggal"])
-    tidy = tidy.sort_values(["tanggal", "jenis"]).reset_index(drop=True)
-
-    df_actual = tidy[tidy["jenis"] == "Aktual"].copy()
-    df_pred = tidy[tidy["jenis"] == "Perkiraan"].copy()
-    return tidy, df_actual, df_pred
-
-def parse_excel(file_path_or_buffer):
-    df_raw = pd.read_excel(file_path_or_buffer, engine="openpyxl")
-    return parse_excel_from_df(df_raw)
-
-# =========================================================
-# CHARTS (BULAN + HOVER ANGKA, IKUT SATUAN)
-# =========================================================
-def make_line_month_chart(df_pred_year: pd.DataFrame, unit_choice: str):
-    if df_pred_year is None or df_pred_year.empty:
-        return None
-
-    u = unit_suffix(unit_choice)
-
-    d = df_pred_year.copy()
-    d["bulan"] = d["tanggal"].dt.to_period("M").dt.to_timestamp()
-    agg = d.groupby("bulan", as_index=False)["nilai"].mean().sort_values("bulan")
-    agg["nilai_u"] = agg["nilai"].apply(lambda x: convert_value_kg_to_unit(x, unit_choice))
-
-    base = alt.Chart(agg).encode(
-        x=alt.X("bulan:T", title="", axis=alt.Axis(format="%b %Y"))
-    )
-
-    line = base.mark_line(strokeWidth=3).encode(
-        y=alt.Y("nilai_u:Q", title=u),
-        color=alt.value("#F6D25E"),
-        tooltip=[
-            alt.Tooltip("bulan:T", title="Bulan", format="%B %Y"),
-            alt.Tooltip("nilai_u:Q", title=f"Perkiraan ({u})", format=",.0f"),
-        ],
-    )
-
-    nearest = alt.selection_point(on="mouseover", fields=["bulan"], nearest=True, empty=False)
-
-    points = base.mark_point(size=80, opacity=0).add_params(nearest)
-    highlight = (
-        base.mark_point(size=90)
-        .encode(y="nilai_u:Q", color=alt.value("#F6D25E"))
-        .transform_filter(nearest)
-    )
-    rule = base.mark_rule(color="#cdbf9b").encode(x="bulan:T").transform_filter(nearest)
-    text = (
-        base.mark_text(align="left", dx=10, dy=-10)
-        .encode(
-            y="nilai_u:Q",
-            text=alt.Text("nilai_u:Q", format=",.0f"),
-            color=alt.value("#2A241C"),
-        )
-        .transform_filter(nearest)
-    )
-
-    chart = (
-        alt.layer(line, points, highlight, rule, text)
-        .properties(height=420)
-        .configure_view(stroke=None)
-        .configure_axis(
-            gridColor="#efe6d7",
-            tickColor="#efe6d7",
-            domainColor="#efe6d7",
-            labelColor="#6f675c",
-            titleColor="#6f675c",
+@st.fragment
+def what_if_panel(agg: pd.DataFrame, unit_choice: str, year: int, factors: dict):
+    # slider hanya mengirim nilai saat dilepas, dan perubahan cuma me-rerun fragment ini
+    w1, w2, w3 = st.columns([1.0, 1.4, 1.0])
+    with w1:
+        global_pct = st.slider("Semua bulan (%)", -50, 100, 0, step=5, key="wi_global",
+                               help="Contoh: outlet baru menambah 20%.")
+    with w2:
+        months = st.multiselect(
+            "Bulan khusus", list(range(1, 13)), format_func=month_name_id, key="wi_months",
+            help="Contoh: bulan Ramadan.",
         )
+    with w3:
+        month_pct = st.slider("Bulan khusus (%)", -50, 100, 15, step=5, key="wi_month_pct")
+
+    wi = apply_what_if(agg, float(global_pct), float(month_pct), months)
+    total_base = float(wi["nilai"].sum())
+    total_new = float(wi["nilai_skenario"].sum())
+    text_kg, text_sisir = fmt_dual_units(total_new, factors["Sisir"])
+    card(
+        f"Total kebutuhan skenario {year}",
+        f"{text_kg}<br><span style='font-size:0.98rem;color:#7A736A;'>≈ {text_sisir}</span>",
+        f"{(total_new - total_base):+,.0f} kg dibanding perkiraan",
     )
-    return chart
-
-def make_bar_month_chart(df_pred_year: pd.DataFrame, unit_choice: str):
-    if df_pred_year is None or df_pred_year.empty:
-        return None
-
-    u = unit_suffix(unit_choice)
-
-    d = df_pred_year.copy()
-    d["bulan"] = d["tanggal"].dt.month
-    d["bulan_nama"] = d["bulan"].apply(month_name_id)
-    agg = d.groupby(["bulan", "bulan_nama"], as_index=False)["nilai"].mean().sort_values("bulan")
-    agg["nilai_u"] = agg["nilai"].apply(lambda x: convert_value_kg_to_unit(x, unit_choice))
-
-    chart = (
-        alt.Chart(agg)
-        .mark_bar(cornerRadiusTopLeft=6, cornerRadiusTopRight=6)
-        .encode(
-            x=alt.X("bulan_nama:N", title="", sort=list(ID_MONTH_NAMES.values())),
-            y=alt.Y("nilai_u:Q", title=u),
-            tooltip=[
-                alt.Tooltip("bulan_nama:N", title="Bulan"),
-                alt.Tooltip("nilai_u:Q", title=f"Perkiraan ({u})", format=",.0f"),
-            ],
-            color=alt.value("#F6D25E"),
-        )
-        .properties(height=360)
-        .configure_view(stroke=None)
-        .configure_axis(
-            gridColor="#efe6d7",
-            tickColor="#efe6d7",
-            domainColor="#efe6d7",
-            labelColor="#6f675c",
-            titleColor="#6f675c",
-        )
-    )
-    return chart
-
-# =========================================================
-# TABLE (kg base)
-# =========================================================
-def month_table(df_pred: pd.DataFrame, year: int):
-    d = df_pred[df_pred["tanggal"].dt.year == year].copy()
-    if d.empty:
-        return d
-
-    d["Bulan"] = d["tanggal"].dt.month.apply(month_name_id)
-    out = d.groupby(["Bulan"], as_index=False).agg(
-        Perkiraan_kg=("nilai", "mean"),
-        Min_kg=("min", "mean"),
-        Maks_kg=("max", "mean"),
-    )
-
-    if "Min_kg" in out.columns and out["Min_kg"].isna().all():
-        out = out.drop(columns=["Min_kg"])
-    if "Maks_kg" in out.columns and out["Maks_kg"].isna().all():
-        out = out.drop(columns=["Maks_kg"])
-
-    return out
+    st.write("")
+    wi_chart = make_what_if_chart(wi, unit_choice, factors[unit_choice])
+    if wi_chart is not None:
+        st.altair_chart(wi_chart, use_container_width=True)
 
 # =========================================================
 # LOAD DATA
 # =========================================================
-@st.cache_data(show_spinner=True)
+@profiled_cache(show_spinner=True)
 def load_default_data():
     excel_path = Path(__file__).parent / "hasil_prediksi_sarima.xlsx"
     if not excel_path.exists():
         raise FileNotFoundError("File 'hasil_prediksi_sarima.xlsx' tidak ditemukan di folder yang sama dengan app.py")
-    return parse_excel(excel_path)
+    return parse_excel(excel_path, source="default")
+
+@profiled_cache(show_spinner=False)
+def default_data_version():
+    tidy = load_default_data()[0]
+    version = dataset_version(tidy)
+    metrics.set_dataset_bytes(version, int(tidy.memory_usage(deep=True).sum()))
+    return version
+
+@profiled_cache(show_spinner=False)
+def cached_series_view(version: str, seri: str, _tidy: pd.DataFrame):
+    return series_view(_tidy, seri)
+
+@profiled_cache(show_spinner=False)
+def series_year_totals(version: str, year: int, _df_pred: pd.DataFrame) -> pd.DataFrame:
+    # group-by lewat kode integer seri (bincount), bukan string
+    d = _df_pred[_df_pred["tanggal"].dt.year == year]
+    codes = d["seri"].cat.codes.to_numpy()
+    cats = d["seri"].cat.categories
+    nilai = d["nilai"].to_numpy(dtype=float)
+    total = np.bincount(codes, weights=nilai, minlength=len(cats))
+    # jumlah bulan berbeda per seri (data harian: banyak baris per bulan)
+    seri_month = np.unique(codes.astype(np.int64) * 12 + d["tanggal"].dt.month.to_numpy() - 1)
+    n_month = np.bincount(seri_month // 12, minlength=len(cats))
+    out = pd.DataFrame({
+        "Produk/Outlet": cats,
+        "Total_kg": total,
+        "Rata2_per_bulan_kg": np.where(n_month > 0, total / np.maximum(n_month, 1), np.nan),
+    })
+    out["Porsi_%"] = out["Total_kg"] / out["Total_kg"].sum() * 100 if out["Total_kg"].sum() else np.nan
+    return out[n_month > 0].reset_index(drop=True)
+
+@profiled_cache(show_spinner=False)
+def cached_unit_factors(version: str, seri: str, year: int, _df_pred: pd.DataFrame) -> dict:
+    return view_unit_factors(_df_pred, seri, year)
+
+@profiled_cache(show_spinner=False)
+def cached_year_unit_factors(version: str, seri: str, _tidy: pd.DataFrame, _years: np.ndarray, _source: np.ndarray) -> dict:
+    # satu rasio per baris matriks tahun x bulan (bobot kg tahun itu sendiri, dari sumber barisnya);
+    # tahun & sumber ditentukan oleh versi + seri, jadi tidak perlu ikut jadi kunci cache
+    by_source = {jenis: _tidy[_tidy["jenis"] == jenis] for jenis in np.unique(_source)}
+    per_year = [view_unit_factors(by_source[src], seri, int(y)) for y, src in zip(_years, _source)]
+    return {un: np.array([f[un] for f in per_year], dtype=float) for un in UNIT_NAMES}
+
+@profiled_cache(show_spinner=False)
+def cached_accuracy_report(version: str, _tidy: pd.DataFrame, window: int):
+    return accuracy_report(_tidy, window)
+
+@profiled_cache(show_spinner=False)
+def cached_granularity(version: str, _tidy: pd.DataFrame) -> str:
+    return detect_granularity(_tidy["tanggal"])
+
+@profiled_cache(show_spinner=False)
+def cached_rollups(version: str, _tidy: pd.DataFrame) -> dict:
+    # harian -> mingguan -> bulanan -> tahunan, sekali per versi dataset + seri
+    rollups = build_rollups(_tidy)
+    preds = {lv: df[df["jenis"] == "Perkiraan"].reset_index(drop=True) for lv, df in rollups.items() if lv != "native"}
+    return rollups, preds
+
+@profiled_cache(show_spinner=False)
+def cached_year_month_matrix(version: str, _df_month: pd.DataFrame):
+    # tahun x bulan, sekali per versi dataset + seri; tahun tanpa perkiraan diisi data aktual
+    pred_years, pred_m = year_month_matrix(_df_month[_df_month["jenis"] == "Perkiraan"])
+    act_years, act_m = year_month_matrix(_df_month[_df_month["jenis"] == "Aktual"])
+    only_act = ~np.isin(act_years, pred_years)
+    years = np.concatenate([pred_years, act_years[only_act]])
+    matrix = np.vstack([pred_m, act_m[only_act]])
+    source = np.array(["Perkiraan"] * len(pred_years) + ["Aktual"] * int(only_act.sum()))
+    order = np.argsort(years, kind="stable")
+    return years[order], matrix[order], source[order]
+
+@profiled_cache(show_spinner=False)
+def cached_month_aggregates(version: str, year: int, _df_pred: pd.DataFrame):
+    d = _df_pred[_df_pred["tanggal"].dt.year == year]
+    agg = d.groupby(d["tanggal"].dt.month.rename("bulan"))[["nilai", "min", "max"]].mean().reset_index()
+    agg.insert(1, "bulan_nama", agg["bulan"].map(month_name_id))
+    return agg
+
+@profiled_cache(show_spinner=False)
+def cached_procurement_plan(version: str, year: int, service_level: float, stock_on_hand: float, sisir_per_kg: float, _tbl: pd.DataFrame):
+    plan = procurement_plan(
+        _tbl["Perkiraan_kg"].to_numpy(),
+        _tbl["Min_kg"].to_numpy() if "Min_kg" in _tbl.columns else None,
+        _tbl["Maks_kg"].to_numpy() if "Maks_kg" in _tbl.columns else None,
+        service_level=service_level,
+        stock_on_hand=stock_on_hand,
+        sisir_per_kg=sisir_per_kg,
+    )
+    plan.insert(0, "Bulan", _tbl["Bulan"].to_numpy())
+    return plan
 
 if "data_override" not in st.session_state:
     st.session_state.data_override = None
@@ -585,14 +461,19 @@ if "page" not in st.session_state:
 if "mode_umkm" not in st.session_state:
     st.session_state.mode_umkm = True
 
-tidy_all, df_actual_all, df_pred_all = load_default_data()
+with PROF.section("load_default_data"):
+    tidy_all, df_actual_all, df_pred_all = load_default_data()
+    data_version = default_data_version()
+# laporan statis untuk pengunjung (data bawaan); dibangun di latar belakang sekali per versi
+static_report.export_from_env(tidy_all, data_version)
 if st.session_state.data_override is not None:
     tidy_all, df_actual_all, df_pred_all = st.session_state.data_override
+    data_version = st.session_state.data_version
 
 # =========================================================
 # SIDEBAR (UMKM LABELS)
 # =========================================================
-with st.sidebar:
+with PROF.section("sidebar"), st.sidebar:
     st.markdown(
         f"""
         <div style="display:flex;align-items:center;gap:10px;margin-bottom:12px;">
@@ -607,7 +488,7 @@ with st.sidebar:
         unsafe_allow_html=True
     )
 
-    mode_umkm = st.toggle("Mode UMKM", value=st.session_state.mode_umkm, key="mode_umkm")
+    mode_umkm = st.toggle("Mode UMKM", key="mode_umkm")
 
     st.markdown("<div style='height:8px'></div>", unsafe_allow_html=True)
     st.markdown(
@@ -625,14 +506,18 @@ with st.sidebar:
     is_dash = (st.session_state.page == "Dashboard")
     is_detail = (st.session_state.page == "Detail")
     is_upload = (st.session_state.page == "Upload")
+    is_compare = (st.session_state.page == "Compare")
 
     label_dash = "🏠  Beranda" + (" ✅" if is_dash else "")
     label_detail = "📊  Lihat Rincian Bulanan" + (" ✅" if is_detail else "")
+    label_compare = "📈  Bandingkan Antar Tahun" + (" ✅" if is_compare else "")
 
     if st.button(label_dash, use_container_width=True, key="nav_dash"):
         go("Dashboard")
     if st.button(label_detail, use_container_width=True, key="nav_detail"):
         go("Detail")
+    if st.button(label_compare, use_container_width=True, key="nav_compare"):
+        go("Compare")
 
     if not mode_umkm:
         st.markdown("<hr/>", unsafe_allow_html=True)
@@ -649,6 +534,12 @@ with st.sidebar:
             unsafe_allow_html=True
         )
 
+        st.toggle(
+            "⏱️ Profil rerun",
+            key="profiling",
+            help="Catat waktu tiap bagian halaman (hanya untuk Admin). Matikan kalau tidak dipakai.",
+        )
+
     st.markdown("<div style='height:18px'></div>", unsafe_allow_html=True)
     st.markdown(
         "<div class='small-muted'>Tips: Pilih tahun, bulan, satuan → klik <b>Tampilkan</b>.</div>",
@@ -656,6 +547,7 @@ with st.sidebar:
     )
 
 page = st.session_state.page
+PROF.set_page(page)
 if st.session_state.mode_umkm and page == "Upload":
     st.session_state.page = "Dashboard"
     st.rerun()
@@ -663,32 +555,33 @@ if st.session_state.mode_umkm and page == "Upload":
 # =========================================================
 # HEADER
 # =========================================================
-st.markdown(
-    f"""
-    <div class="header-wrap">
-      <div class="logo-circle">{logo_html}</div>
-      <div>
-        <div class="header-title">Berapa Pisang yang Perlu Disiapkan?</div>
-      </div>
-    </div>
-    """,
-    unsafe_allow_html=True
-)
-st.write("")
+with PROF.section("html: header"):
+    st.markdown(
+        f"""
+        <div class="header-wrap">
+          <div class="logo-circle">{logo_html}</div>
+          <div>
+            <div class="header-title">Berapa Pisang yang Perlu Disiapkan?</div>
+          </div>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+    st.write("")
 
-st.markdown(
-    """
-    <div class="info-banner">
-      <div class="info-icon">i</div>
-      <div>
-        Pilih <b>tahun</b>, <b>bulan</b>, dan <b>satuan</b>, lalu klik <b>Tampilkan</b>.  
-        (Arahkan mouse ke garis kuning untuk melihat angka tiap bulan)
-      </div>
-    </div>
-    """,
-    unsafe_allow_html=True
-)
-st.write("")
+    st.markdown(
+        """
+        <div class="info-banner">
+          <div class="info-icon">i</div>
+          <div>
+            Pilih <b>tahun</b>, <b>bulan</b>, dan <b>satuan</b>, lalu klik <b>Tampilkan</b>.  
+            (Arahkan mouse ke garis kuning untuk melihat angka tiap bulan)
+          </div>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+    st.write("")
 
 # =========================================================
 # FILTER CARD + SUBMIT (Tahun + Bulan + Satuan)
@@ -696,18 +589,35 @@ st.write("")
 years_available = sorted(df_pred_all["tanggal"].dt.year.unique()) if not df_pred_all.empty else []
 if not years_available:
     empty_state("Tidak ada data prediksi", "Cek file Excel bawaan atau ganti data prediksi (Admin).")
-    st.stop()
+    stop_rerun()
 
 if "filter_year" not in st.session_state:
     st.session_state.filter_year = years_available[0]
 if "filter_month" not in st.session_state:
     st.session_state.filter_month = "Semua Bulan"
-if "filter_unit" not in st.session_state:
-    st.session_state.filter_unit = "Kg"
+if st.session_state.get("filter_unit") not in UNIT_NAMES:
+    st.session_state.filter_unit = BASE_UNIT
+
+series_available = series_options(tidy_all)
+if st.session_state.get("filter_series") not in series_available:
+    st.session_state.filter_series = series_available[0]
+if st.session_state.filter_year not in years_available:
+    st.session_state.filter_year = years_available[0]
+multi_series = len(series_available) > 1
+
+# tampilan mingguan hanya masuk akal kalau data aslinya harian/mingguan
+levels_available = ["W", "M"] if cached_granularity(data_version, tidy_all) in ("D", "W") else ["M"]
+if st.session_state.get("filter_level") not in levels_available:
+    st.session_state.filter_level = "M"
+multi_level = len(levels_available) > 1
 
 st.markdown("<div class='filter-card'>", unsafe_allow_html=True)
-with st.form("form_filter"):
-    cA, cB, cC, cU, cD = st.columns([2.0, 1.0, 1.0, 1.0, 1.0])
+with PROF.section("filter form"), st.form("form_filter"):
+    cols = iter(st.columns([2.0] + [1.2] * multi_series + [1.0] * multi_level + [1.0, 1.0, 1.0, 1.0]))
+    cA = next(cols)
+    cS = next(cols) if multi_series else None
+    cL = next(cols) if multi_level else None
+    cB, cC, cU, cD = cols
 
     with cA:
         st.markdown("<div class='filter-title'>Pilih Periode</div>", unsafe_allow_html=True)
@@ -716,6 +626,25 @@ with st.form("form_filter"):
             unsafe_allow_html=True
         )
 
+    seri = st.session_state.filter_series
+    if multi_series:
+        with cS:
+            seri = st.selectbox(
+                "Produk / Outlet",
+                series_available,
+                index=series_available.index(st.session_state.filter_series),
+            )
+
+    level = st.session_state.filter_level
+    if multi_level:
+        with cL:
+            level = st.selectbox(
+                "Tampilan",
+                levels_available,
+                index=levels_available.index(st.session_state.filter_level),
+                format_func=LEVEL_LABELS.get,
+            )
+
     with cB:
         year = st.selectbox(
             "Tahun",
@@ -734,8 +663,8 @@ with st.form("form_filter"):
     with cU:
         unit = st.selectbox(
             "Satuan (untuk grafik)",
-            ["Kg", "Sisir"],
-            index=["Kg", "Sisir"].index(st.session_state.filter_unit),
+            UNIT_NAMES,
+            index=UNIT_NAMES.index(st.session_state.filter_unit),
         )
 
     with cD:
@@ -749,13 +678,25 @@ if submit:
     st.session_state.filter_year = year
     st.session_state.filter_month = month
     st.session_state.filter_unit = unit
+    st.session_state.filter_series = seri
+    st.session_state.filter_level = level
 
+seri = st.session_state.filter_series
+level = st.session_state.filter_level
 year = st.session_state.filter_year
 month_name = st.session_state.filter_month
 unit_choice = st.session_state.filter_unit
 u = unit_suffix(unit_choice)
 
-df_pred_year = df_pred_all[df_pred_all["tanggal"].dt.year == int(year)].copy()
+with PROF.section("view: seri + rollup + tahun"):
+    tidy_view, df_actual_view, df_pred_view = cached_series_view(data_version, seri, tidy_all)
+    view_version = f"{data_version}:{seri}"
+    unit_factors = cached_unit_factors(data_version, seri, int(year), df_pred_all)
+
+    rollups, pred_rollups = cached_rollups(view_version, tidy_view)
+    df_pred_month = pred_rollups["M"]
+
+    df_pred_year = df_pred_month[df_pred_month["tanggal"].dt.year == int(year)].copy()
 
 # =========================================================
 # PAGE: BERANDA (Dashboard)
@@ -778,7 +719,7 @@ if page == "Dashboard":
             card("Perkiraan pisang yang perlu disiapkan", "Data belum ada", "Coba pilih bulan lain.", big=True)
         else:
             v_kg = float(df_month["nilai"].mean())
-            text_kg, text_sisir = fmt_dual_units(v_kg)
+            text_kg, text_sisir = fmt_dual_units(v_kg, unit_factors["Sisir"])
 
             card(
                 "Perkiraan pisang yang perlu disiapkan",
@@ -788,19 +729,42 @@ if page == "Dashboard":
             )
 
     st.write("")
-    st.markdown("### Perkiraan kebutuhan pisang per bulan")
+    period_word = "minggu" if level == "W" else "bulan"
+    st.markdown(f"### Perkiraan kebutuhan pisang per {period_word}")
     st.markdown(
-        "<div class='small-muted'>Arahkan mouse ke garis kuning untuk melihat angka tiap bulan.</div>",
+        f"<div class='small-muted'>Arahkan mouse ke garis kuning untuk melihat angka tiap {period_word}.</div>",
         unsafe_allow_html=True
     )
     st.write("")
 
-    chart = make_line_month_chart(df_pred_year, unit_choice)
+    if level == "W":
+        df_line = pred_rollups["W"][pred_rollups["W"]["tanggal"].dt.year == int(year)]
+        if month_name != "Semua Bulan":
+            df_line = df_line[df_line["tanggal"].dt.month == int(month_num)]
+    else:
+        df_line = df_pred_year
+    with PROF.section("chart: line"):
+        chart = make_line_month_chart(df_line, unit_choice, unit_factors[unit_choice], level)
+    PROF.chart_payload("line", chart)
     if chart is None:
         empty_state("Grafik belum tersedia", "Data prediksi untuk tahun ini belum ada.")
     else:
         st.altair_chart(chart, use_container_width=True)
 
+    st.write("")
+    with st.expander("Coba skenario (what-if)"):
+        st.markdown(
+            "<div class='small-muted'>Geser persentase untuk melihat kebutuhan jika penjualan naik/turun. "
+            "Angka perkiraan asli tidak berubah.</div>",
+            unsafe_allow_html=True
+        )
+        month_agg = cached_month_aggregates(view_version, int(year), df_pred_month)
+        if month_agg.empty:
+            st.caption("Data prediksi untuk tahun ini belum ada.")
+        else:
+            with PROF.section("what-if"):
+                what_if_panel(month_agg, unit_choice, int(year), unit_factors)
+
     st.write("")
     st.markdown(
         """
@@ -824,7 +788,7 @@ elif page == "Detail":
 
     if df_pred_year.empty:
         empty_state("Data tahun ini belum ada", "Coba pilih tahun lain.")
-        st.stop()
+        stop_rerun()
 
     st.markdown("<div class='card'>", unsafe_allow_html=True)
     st.markdown("### Grafik ringkas per bulan")
@@ -832,7 +796,9 @@ elif page == "Detail":
         "<div class='small-muted'>Grafik mengikuti satuan pilihan di filter (kg / sisir).</div>",
         unsafe_allow_html=True
     )
-    bar = make_bar_month_chart(df_pred_year, unit_choice)
+    with PROF.section("chart: bar"):
+        bar = make_bar_month_chart(df_pred_year, unit_choice, unit_factors[unit_choice])
+    PROF.chart_payload("bar", bar)
     if bar is not None:
         st.altair_chart(bar, use_container_width=True)
     else:
@@ -840,30 +806,28 @@ elif page == "Detail":
     st.markdown("</div>", unsafe_allow_html=True)
     st.write("")
 
-    st.markdown("### Tabel perkiraan kebutuhan per bulan (kg & sisir)")
-    tbl = month_table(df_pred_all, int(year))
+    st.markdown(f"### Tabel perkiraan kebutuhan per bulan ({', '.join(unit_suffix(un) for un in UNIT_NAMES)})")
+    with PROF.section("month_table"):
+        tbl = month_table(df_pred_month, int(year))
     if tbl.empty:
         st.caption("Belum ada data prediksi.")
     else:
-        tbl_show = tbl.copy()
-
-        # bikin versi sisir dari kolom kg (selalu tampil dua-duanya)
-        for col in ["Perkiraan_kg", "Min_kg", "Maks_kg"]:
-            if col in tbl_show.columns:
-                tbl_show[col.replace("_kg", "_sisir")] = tbl_show[col].apply(
-                    lambda x: convert_value_kg_to_unit(x, "Sisir")
-                )
-
-        tbl_show = tbl_show.rename(columns={
-            "Perkiraan_kg": "Perkiraan (kg)",
-            "Min_kg": "Min (kg)",
-            "Maks_kg": "Maks (kg)",
-            "Perkiraan_sisir": "Perkiraan (sisir)",
-            "Min_sisir": "Min (sisir)",
-            "Maks_sisir": "Maks (sisir)",
-        })
-
-        st.dataframe(tbl_show, use_container_width=True, hide_index=True)
+        # semua satuan dihitung sekali dari kolom kg; dipakai untuk tabel dan unduhan
+        tbl_units = add_unit_columns(tbl, unit_factors)
+        st.dataframe(tbl_units.rename(columns=unit_column_labels), use_container_width=True, hide_index=True)
+
+    if level == "W":
+        st.write("")
+        st.markdown("### Tabel perkiraan kebutuhan per minggu")
+        wtbl = week_table(pred_rollups["W"], int(year))
+        if wtbl.empty:
+            st.caption("Belum ada data mingguan.")
+        else:
+            st.dataframe(
+                add_unit_columns(wtbl, unit_factors).rename(columns=unit_column_labels),
+                use_container_width=True,
+                hide_index=True,
+            )
 
     st.write("")
     g = df_pred_year.groupby("tanggal")["nilai"].mean().sort_index()
@@ -872,9 +836,9 @@ elif page == "Detail":
     idx_peak = g.idxmax()
     peak_val_kg = float(g.max())
 
-    total_year_sisir = convert_value_kg_to_unit(total_year_kg, "Sisir")
-    avg_month_sisir = convert_value_kg_to_unit(avg_month_kg, "Sisir")
-    peak_val_sisir = convert_value_kg_to_unit(peak_val_kg, "Sisir")
+    total_year_sisir = convert_value_kg_to_unit(total_year_kg, "Sisir", unit_factors["Sisir"])
+    avg_month_sisir = convert_value_kg_to_unit(avg_month_kg, "Sisir", unit_factors["Sisir"])
+    peak_val_sisir = convert_value_kg_to_unit(peak_val_kg, "Sisir", unit_factors["Sisir"])
 
     c1, c2, c3 = st.columns(3)
     with c1:
@@ -884,6 +848,66 @@ elif page == "Detail":
     with c3:
         card("Bulan kebutuhan tertinggi", month_name_id(idx_peak.month), f"± {fmt_int(peak_val_kg)} kg<br><span style='font-size:0.98rem;color:#7A736A;'>≈ {fmt_int(peak_val_sisir)} sisir</span>")
 
+    if multi_series:
+        st.write("")
+        st.markdown(f"### Kebutuhan per produk/outlet ({year})")
+        st.dataframe(
+            series_year_totals(data_version, int(year), df_pred_all).rename(columns={
+                "Total_kg": "Total (kg)",
+                "Rata2_per_bulan_kg": "Rata-rata per bulan (kg)",
+                "Porsi_%": "Porsi (%)",
+            }),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+    st.write("")
+    # judul bergantung pada sumber perbandingan, jadi diisi setelah akurasi dihitung
+    acc_header = st.container()
+    acc_window = st.selectbox("Jendela bergulir (bulan)", [3, 6, 12], index=2, key="acc_window")
+    with PROF.section("accuracy"):
+        acc = cached_accuracy_report(view_version, rollups["M"], int(acc_window))
+    acc_sum = acc["summary"]
+
+    with acc_header:
+        if acc_sum["n"] and acc_sum["n_fitted"] == acc_sum["n"]:
+            # hanya nilai fitted (in-sample) yang bertemu data aktual -> kecocokan model, bukan akurasi perkiraan
+            st.markdown("### Seberapa cocok model dengan data lama?")
+            acc_note = ("Semua bulan di bawah memakai nilai <b>fitted</b> (in-sample): model sudah melihat data ini, "
+                        "jadi angkanya cenderung lebih bagus daripada ketepatan perkiraan ke depan.")
+        else:
+            st.markdown("### Seberapa tepat perkiraan sebelumnya?")
+            acc_note = "Membandingkan data aktual dengan perkiraan di bulan yang sama."
+        st.markdown(
+            f"<div class='small-muted'>{acc_note} "
+            "(MAPE = rata-rata selisih dalam persen; bias positif = perkiraan cenderung kelebihan).</div>",
+            unsafe_allow_html=True
+        )
+
+    if acc_sum["n"] == 0:
+        st.caption("Belum ada bulan yang punya data aktual dan perkiraan sekaligus.")
+    else:
+        a1, a2, a3 = st.columns(3)
+        with a1:
+            n_fc = acc_sum["n"] - acc_sum["n_fitted"]
+            card("MAPE", fmt_pct(acc_sum["mape"]), f"Dari {acc_sum['n']} bulan ({n_fc} perkiraan, {acc_sum['n_fitted']} fitted)")
+        with a2:
+            card("Bias", f"{acc_sum['bias']:+,.0f} kg", f"{acc_sum['bias_pct']:+,.1f}% dari total aktual")
+        with a3:
+            card(
+                "Aktual di dalam rentang min–maks",
+                fmt_pct(acc_sum["coverage"]),
+                f"Dari {acc_sum['n_interval']} bulan ber-rentang" if acc_sum["n_interval"] else "Tidak ada rentang min–maks",
+            )
+
+        st.write("")
+        with PROF.section("chart: accuracy"):
+            acc_chart = make_rolling_accuracy_chart(acc["rolling"])
+        PROF.chart_payload("accuracy", acc_chart)
+        if acc_chart is not None:
+            st.altair_chart(acc_chart, use_container_width=True)
+        st.dataframe(acc["per_year"], use_container_width=True, hide_index=True)
+
     st.write("")
     st.markdown("### Saran untuk usaha")
     st.markdown(
@@ -892,54 +916,130 @@ elif page == "Detail":
         "- Gunakan angka ini sebagai panduan, lalu sesuaikan dengan kondisi penjualan nyata."
     )
 
-    st.write("")
     if not tbl.empty:
-        # export: dua satuan juga
-        export_df = tbl.copy()
-        for col in ["Perkiraan_kg", "Min_kg", "Maks_kg"]:
-            if col in export_df.columns:
-                export_df[col.replace("_kg", "_sisir")] = export_df[col].apply(
-                    lambda x: convert_value_kg_to_unit(x, "Sisir")
-                )
-
-        export_df = export_df.rename(columns={
-            "Perkiraan_kg": "Perkiraan_kg",
-            "Min_kg": "Min_kg",
-            "Maks_kg": "Maks_kg",
-            "Perkiraan_sisir": "Perkiraan_sisir",
-            "Min_sisir": "Min_sisir",
-            "Maks_sisir": "Maks_sisir",
-        })
+        st.write("")
+        st.markdown("#### Saran jumlah belanja (simulasi)")
+        st.markdown(
+            "<div class='small-muted'>Dihitung dari ribuan kemungkinan kebutuhan di antara angka min dan maks. "
+            "Cadangan = tambahan di atas angka perkiraan agar target stok cukup tercapai; "
+            "stok yang sudah ada dipakai mulai bulan pertama.</div>",
+            unsafe_allow_html=True
+        )
+        s1, s2 = st.columns(2)
+        with s1:
+            service_pct = st.selectbox("Target stok cukup (%)", [80, 90, 95, 99], index=2, key="sim_service")
+        with s2:
+            stock_kg = st.number_input("Stok yang sudah ada (kg)", min_value=0.0, value=0.0, step=10.0, key="sim_stock")
+
+        with PROF.section("simulation"):
+            plan = cached_procurement_plan(view_version, int(year), service_pct / 100, float(stock_kg), unit_factors["Sisir"], tbl)
+        st.dataframe(
+            plan.rename(columns={
+                "Perkiraan_kg": "Perkiraan (kg)",
+                "Cadangan_kg": "Cadangan (kg)",
+                "Rata2_kekurangan_kg": "Rata-rata kekurangan jika beli sesuai perkiraan (kg)",
+                "Pakai_stok_kg": "Dari stok yang ada (kg)",
+                "Saran_beli_kg": "Saran beli (kg)",
+                "Saran_beli_sisir": "Saran beli (sisir)",
+                "Peluang_kehabisan_saran_%": "Peluang kehabisan jika ikut saran (%)",
+            }),
+            use_container_width=True,
+            hide_index=True,
+        )
 
-        xlsx_bytes = to_excel_bytes(export_df, sheet_name=f"Rincian_{year}")
+    st.write("")
+    if not tbl.empty:
+        # export: semua satuan juga (kolom sama dengan tabel di atas)
+        with PROF.section("to_excel_bytes"):
+            xlsx_bytes = to_excel_bytes(tbl_units, sheet_name=f"Rincian_{year}")
         st.download_button(
-            "⬇️ Unduh tabel rincian (kg & sisir)",
+            f"⬇️ Unduh tabel rincian ({', '.join(unit_suffix(un) for un in UNIT_NAMES)})",
             data=xlsx_bytes,
-            file_name=f"rincian_kebutuhan_{year}_kg_sisir.xlsx",
+            file_name=f"rincian_kebutuhan_{year}_{'_'.join(unit_suffix(un) for un in UNIT_NAMES)}.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             use_container_width=True,
         )
 
+# =========================================================
+# PAGE: BANDINGKAN ANTAR TAHUN (Compare)
+# =========================================================
+elif page == "Compare":
+    st.markdown("### Bandingkan kebutuhan antar tahun")
+    st.markdown(
+        "<div class='small-muted'>Pilih beberapa tahun untuk melihat kebutuhan tiap bulan berdampingan. "
+        "Persentase = naik/turun dibanding tahun sebelumnya yang dipilih, di bulan yang sama.</div>",
+        unsafe_allow_html=True
+    )
+    st.write("")
+
+    with PROF.section("compare: matrix"):
+        cmp_years, cmp_matrix, cmp_source = cached_year_month_matrix(view_version, rollups["M"])
+        cmp_factors = cached_year_unit_factors(data_version, seri, tidy_all, cmp_years, cmp_source)
+    if len(cmp_years) == 0:
+        empty_state("Data belum tersedia", "Belum ada data bulanan untuk dibandingkan.")
+        stop_rerun()
+
+    year_labels = [f"{y} ({src})" if src == "Aktual" else str(y) for y, src in zip(cmp_years, cmp_source)]
+    picked = st.multiselect(
+        "Tahun",
+        list(range(len(cmp_years))),
+        default=list(range(max(len(cmp_years) - 2, 0), len(cmp_years))),
+        format_func=lambda i: year_labels[i],
+        key="cmp_years",
+    )
+    if not picked:
+        st.caption("Pilih minimal satu tahun.")
+        stop_rerun()
+
+    idx = np.sort(np.asarray(picked))
+    sub = cmp_matrix[idx] * cmp_factors[unit_choice][idx, None]
+    growth = growth_pct(sub)
+    sub_years = cmp_years[idx]
+
+    cmp_tbl = pd.DataFrame({"Bulan": [month_name_id(m) for m in range(1, 13)]})
+    for i, y in enumerate(sub_years):
+        cmp_tbl[f"{y} ({u})"] = sub[i]
+        if i > 0:
+            cmp_tbl[f"{y} vs {sub_years[i - 1]} (%)"] = growth[i]
+    totals = {"Bulan": "Total", **{f"{y} ({u})": np.nansum(sub[i]) for i, y in enumerate(sub_years)}}
+    cmp_tbl = pd.concat([cmp_tbl, pd.DataFrame([totals])], ignore_index=True)
+
+    cmp_long = pd.DataFrame({
+        "tahun": np.repeat(sub_years.astype(str), 12),
+        "bulan_nama": np.tile([month_name_id(m) for m in range(1, 13)], len(sub_years)),
+        "nilai_u": sub.ravel(),
+        "tumbuh": growth.ravel(),
+    }).dropna(subset=["nilai_u"])
+
+    with PROF.section("chart: overlay"):
+        overlay = make_year_overlay_chart(cmp_long, unit_choice)
+    PROF.chart_payload("overlay", overlay)
+    if overlay is not None:
+        st.altair_chart(overlay, use_container_width=True)
+    st.dataframe(cmp_tbl, use_container_width=True, hide_index=True)
+
 # =========================================================
 # PAGE: UPLOAD (Admin)
 # =========================================================
 elif page == "Upload":
     st.markdown("## Ganti Data Prediksi")
     st.markdown(
-        "<div class='small-muted'>Unggah file Excel hasil perhitungan.</div>",
+        "<div class='small-muted'>Unggah file hasil perhitungan (Excel .xlsx/.xls, OpenDocument .ods, atau CSV).</div>",
         unsafe_allow_html=True
     )
     st.write("")
 
     st.markdown("<div class='card'>", unsafe_allow_html=True)
-    st.markdown("### Upload file Excel")
+    st.markdown("### Upload file prediksi")
     st.markdown(
         "<div class='small-muted'>Setelah upload, cek preview. Kalau sudah benar, klik <b>Konfirmasi & Simpan</b>.</div>",
         unsafe_allow_html=True
     )
     st.write("")
 
-    uploaded = st.file_uploader("Pilih file Excel (.xlsx)", type=["xlsx", "xls"], label_visibility="collapsed")
+    uploaded = st.file_uploader(
+        "Pilih file (.xlsx, .xls, .ods, .csv)", type=UPLOAD_TYPES, label_visibility="collapsed"
+    )
 
     if uploaded is None:
         st.markdown(
@@ -948,7 +1048,20 @@ elif page == "Upload":
         )
     else:
         try:
-            tidy_new, act_new, pred_new = parse_excel(uploaded)
+            with PROF.section("parse upload"):
+                tidy_new, act_new, pred_new, sheets_new, parse_s = parse_workbook(uploaded)
+
+            st.caption(
+                f"Format terbaca: {sheets_new['Format'].iat[0]} · {len(tidy_new):,} baris data "
+                f"· {parse_s * 1000:,.0f} ms"
+            )
+            if len(sheets_new) > 1:
+                st.write(f"Sheet terbaca ({len(sheets_new)}):")
+                st.dataframe(
+                    sheets_new.rename(columns={"Waktu_ms": "Waktu (ms)"}),
+                    use_container_width=True,
+                    hide_index=True,
+                )
 
             st.write("Preview data perkiraan (5 baris):")
             st.dataframe(pred_new.head(5), use_container_width=True)
@@ -956,10 +1069,12 @@ elif page == "Upload":
             col1, col2 = st.columns([1, 1])
             with col1:
                 if st.button("Batal", use_container_width=True):
-                    st.stop()
+                    stop_rerun()
             with col2:
                 if st.button("Konfirmasi & Simpan", use_container_width=True):
                     st.session_state.data_override = (tidy_new, act_new, pred_new)
+                    st.session_state.data_version = dataset_version(tidy_new)
+                    metrics.track_dataset(st.session_state.data_version, tidy_new)
                     st.success("Berhasil! Data dashboard sudah diperbarui.")
                     st.session_state.page = "Dashboard"
                     st.rerun()
@@ -969,7 +1084,43 @@ elif page == "Upload":
 
     st.markdown("</div>", unsafe_allow_html=True)
 
-
-
-
-
+# =========================================================
+# PANEL PROFIL RERUN (Admin)
+# =========================================================
+finish_rerun()
+if PROF.enabled and not st.session_state.mode_umkm:
+    st.write("")
+    with st.expander(f"⏱️ Profil rerun ({len(PROF.history)} terakhir)", expanded=True):
+        runs = list(PROF.history)
+        last = runs[-1]
+        st.markdown(
+            f"<div class='small-muted'>Rerun terakhir: <b>{run_total(last) * 1000:,.0f} ms</b> "
+            f"(halaman {last['page']}). Rerun yang berhenti lebih awal dihitung sampai bagian terakhirnya.</div>",
+            unsafe_allow_html=True
+        )
+        wf = waterfall_frame(last)
+        if not wf.empty:
+            st.altair_chart(
+                alt.Chart(wf)
+                .mark_bar(color="#F6D25E", cornerRadius=4)
+                .encode(
+                    x=alt.X("mulai_ms:Q", title="ms sejak awal rerun"),
+                    x2="selesai_ms:Q",
+                    y=alt.Y("bagian:N", title="", sort=wf["bagian"].tolist()),
+                    tooltip=[
+                        alt.Tooltip("bagian:N", title="Bagian"),
+                        alt.Tooltip("durasi_ms:Q", title="Durasi (ms)", format=",.1f"),
+                    ],
+                )
+                .properties(height=max(120, 24 * len(wf))),
+                use_container_width=True,
+            )
+        p1, p2 = st.columns([1.6, 1.0])
+        with p1:
+            st.markdown("**Persentil per bagian (ms)**")
+            st.dataframe(section_percentiles(runs), use_container_width=True, hide_index=True)
+        with p2:
+            st.markdown("**Cache hit rate**")
+            st.dataframe(cache_hit_rates(runs), use_container_width=True, hide_index=True)
+            st.markdown("**Ukuran data grafik**")
+            st.dataframe(payload_frame(last), use_container_width=True, hide_index=True)
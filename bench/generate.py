@@ -0,0 +1,115 @@
+"""Workbook sintetis untuk benchmark, dalam semua tata letak yang dikenali ingest.py.
+
+Tata letak (LAYOUTS):
+- "tanggal"     : satu kolom tanggal (harian; kalau baris sangat banyak, beberapa baris per hari)
+- "tahun_bulan" : kolom tahun + bulan berupa angka
+- "nama_bulan"  : kolom tahun + nama bulan Indonesia ("Januari", ...)
+
+Kolom angka meniru hasil_prediksi_sarima.xlsx: actual + fitted untuk 3/4 baris pertama (riwayat),
+prediksi_mean (+ lower/upper kalau `bands=True`) untuk sisanya. Data sama persis untuk seed yang sama.
+
+    python -m bench.generate --rows 5000 --layout nama_bulan --series 3 --out contoh.xlsx
+    python -m bench.generate --rows 1e6 --layout tanggal --out besar.csv
+"""
+import argparse
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from report import ID_MONTH_NAMES
+
+LAYOUTS = ("tanggal", "tahun_bulan", "nama_bulan")
+SERIES_NAMES = ("kepok", "raja", "ambon", "tanduk", "barangan", "mas", "susu", "nangka")
+START = pd.Timestamp("2000-01-01")
+SPAN_DAYS = 40 * 365
+SPAN_MONTHS = 40 * 12
+HISTORY_SHARE = 0.75
+EXCEL_MAX_ROWS = 1_048_575  # batas baris per sheet xlsx (tanpa header)
+DEFAULT_SEED = 42
+
+
+def _dates(rows: int) -> pd.DatetimeIndex:
+    if rows <= SPAN_DAYS:
+        return pd.date_range(START, periods=rows, freq="D")
+    # lebih dari satu baris per hari: jam-jaman tetap di rentang SPAN_DAYS (granularitas tetap harian)
+    step = np.int64(SPAN_DAYS * 86_400 // rows)
+    return START + pd.to_timedelta(np.arange(rows, dtype=np.int64) * step, unit="s")
+
+
+def _months(rows: int) -> np.ndarray:
+    # indeks bulan 0..SPAN_MONTHS-1; baris > SPAN_MONTHS berarti baris ganda per bulan (dirata-rata parser)
+    n_months = min(rows, SPAN_MONTHS)
+    return np.arange(rows, dtype=np.int64) * n_months // rows
+
+
+def synthetic_frame(rows: int, layout: str = "tanggal", bands: bool = True, series: int = 1,
+                    seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    if layout not in LAYOUTS:
+        raise ValueError(f"Tata letak tidak dikenal: {layout} (pilih {', '.join(LAYOUTS)})")
+    if not 1 <= series <= len(SERIES_NAMES):
+        raise ValueError(f"Jumlah seri harus 1..{len(SERIES_NAMES)}")
+
+    rng = np.random.default_rng(seed)
+    if layout == "tanggal":
+        tanggal = _dates(rows)
+        out = {"tanggal": tanggal}
+        month = tanggal.month.to_numpy()
+        t = np.linspace(0.0, 1.0, rows)
+    else:
+        idx = _months(rows)
+        month = idx % 12 + 1
+        out = {
+            "tahun": START.year + idx // 12,
+            "bulan": np.asarray(list(ID_MONTH_NAMES.values()))[month - 1] if layout == "nama_bulan" else month,
+        }
+        t = idx / SPAN_MONTHS
+
+    history = np.arange(rows) < int(rows * HISTORY_SHARE)
+    season = 1.0 + 0.2 * np.sin(2 * np.pi * (month - 1) / 12)
+    for k in range(series):
+        sfx = f"_{SERIES_NAMES[k]}" if series > 1 else ""
+        level = (200.0 + 40.0 * k) * season * (1.0 + 0.3 * t)
+        actual = np.round(level * rng.normal(1.0, 0.08, rows))
+        fitted = np.round(level * rng.normal(1.0, 0.03, rows))
+        mean = np.round(level * rng.normal(1.0, 0.03, rows))
+        out[f"actual{sfx}"] = np.where(history, actual, np.nan)
+        out[f"fitted{sfx}"] = np.where(history, fitted, np.nan)
+        out[f"prediksi_mean{sfx}"] = np.where(history, np.nan, mean)
+        if bands:
+            out[f"lower{sfx}"] = np.where(history, np.nan, np.round(mean * 0.85))
+            out[f"upper{sfx}"] = np.where(history, np.nan, np.round(mean * 1.15))
+    return pd.DataFrame(out)
+
+
+def workbook_bytes(df: pd.DataFrame, sheet_name: str = "Sheet1", fmt: str = "xlsx") -> bytes:
+    # xls tidak bisa ditulis pandas (xlwt sudah tidak didukung), jadi hanya xlsx/ods/csv
+    if fmt == "csv":
+        return df.to_csv(index=False).encode("utf-8")
+    if len(df) > EXCEL_MAX_ROWS:
+        raise ValueError(f"{fmt} maksimal {EXCEL_MAX_ROWS:,} baris per sheet (diminta {len(df):,})")
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine={"xlsx": "openpyxl", "ods": "odf"}[fmt]) as writer:
+        df.to_excel(writer, index=False, sheet_name=sheet_name)
+    return output.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Buat workbook prediksi sintetis.")
+    parser.add_argument("--rows", type=lambda s: int(float(s)), default=1000)
+    parser.add_argument("--layout", choices=LAYOUTS, default="tanggal")
+    parser.add_argument("--series", type=int, default=1)
+    parser.add_argument("--no-bands", action="store_true", help="tanpa kolom lower/upper")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--out", required=True, help="path .xlsx, .ods, atau .csv (format dari ekstensi)")
+    args = parser.parse_args(argv)
+
+    df = synthetic_frame(args.rows, args.layout, not args.no_bands, args.series, args.seed)
+    with open(args.out, "wb") as f:
+        f.write(workbook_bytes(df, fmt=Path(args.out).suffix.lstrip(".").lower() or "xlsx"))
+    print(f"{args.out}: {len(df):,} baris, kolom {list(df.columns)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""Uji beban: N sesi simulasi menjalankan app.py asli lewat Streamlit AppTest, tanpa jaringan.
+
+Semua sesi berada di satu proses, jadi berbagi `st.cache_data` dan memori seperti di server. Tiap sesi:
+buka Beranda -> Rincian -> ganti tahun -> ganti bulan -> ganti satuan -> kembali ke Beranda; sesi ke-k
+(`--upload-every`) juga masuk mode Admin dan mengunggah workbook sintetis (bench.generate).
+
+    python -m bench.loadtest --sessions 1,4,8,16 --rounds 2
+    python -m bench.loadtest --sessions 8 --cold --out hasil.json
+
+Dilaporkan per tingkat konkurensi: persentil latensi rerun (per aksi dan total), rerun/detik,
+dan memori puncak proses (RSS). Kegagalan dipisah: `gagal` = exception dari app.py (kode keluar 1),
+`harness` = masalah alat uji sendiri, mis. widget tidak ditemukan atau script tidak jalan (kode keluar 2).
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.logger import set_log_level
+from streamlit.runtime.runtime import Runtime
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest, app_test, local_script_runner
+
+from bench.generate import DEFAULT_SEED, synthetic_frame, workbook_bytes
+from bench.run import RESULTS_DIR, _versions
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+DEFAULT_SESSIONS = (1, 4, 8)
+DEFAULT_ROUNDS = 2
+UPLOAD_EVERY = 4
+UPLOAD_ROWS = 2_000
+RERUN_TIMEOUT = 300
+SAMPLE_INTERVAL = 0.05
+PERCENTILES = (50, 90, 99)
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        # bukan Linux: puncak seumur proses (KB di Linux, byte di macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _MemorySampler:
+    # sampel RSS di thread latar; puncak per tingkat konkurensi
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak = _rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="loadtest-rss", daemon=True)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _rss_bytes())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss_bytes())
+        return False
+
+
+class HarnessError(Exception):
+    # kegagalan alat uji (skenario/AppTest), bukan exception dari app.py
+    pass
+
+
+@contextmanager
+def _server_like_runtime():
+    # AppTest memasang Runtime tiruan global di awal tiap run lalu menghapusnya di akhir, dan meng-compile
+    # app.py ulang tiap run (ScriptCache baru per LocalScriptRunner). Dengan sesi paralel, run yang selesai
+    # duluan mencabut Runtime milik run lain, dan compile paralel bisa gagal ("AST constructor recursion
+    # depth mismatch"). Seperti server sungguhan: satu Runtime dan satu ScriptCache bersama, sudah di-compile
+    # sekali sebelum thread sesi mulai.
+    last = {}
+    script_cache = ScriptCache()
+    try:
+        script_cache.get_bytecode(str(APP_PATH))
+    except Exception as e:
+        raise HarnessError(f"app.py tidak bisa di-compile: {type(e).__name__}: {e}") from e
+    orig_instance, orig_exists = Runtime.__dict__["instance"], Runtime.__dict__["exists"]
+    orig_script_cache = app_test.ScriptCache, local_script_runner.ScriptCache
+
+    def instance(cls):
+        if cls._instance is not None:
+            last["runtime"] = cls._instance
+            return cls._instance
+        if "runtime" in last:
+            return last["runtime"]
+        return orig_instance.__func__(cls)
+
+    def exists(cls):
+        return cls._instance is not None or "runtime" in last
+
+    Runtime.instance, Runtime.exists = classmethod(instance), classmethod(exists)
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+    try:
+        yield
+    finally:
+        Runtime.instance, Runtime.exists = orig_instance, orig_exists
+        app_test.ScriptCache, local_script_runner.ScriptCache = orig_script_cache
+
+
+def _find(elements, what: str, pred):
+    found = next((e for e in elements if pred(e)), None)
+    if found is None:
+        raise HarnessError(f"widget tidak ditemukan: {what}")
+    return found
+
+
+def _selectbox(at: AppTest, label: str):
+    return _find(at.selectbox, f"selectbox '{label}'", lambda s: s.label == label)
+
+
+def _button(at: AppTest, label: str):
+    return _find(at.button, f"tombol '{label}'", lambda b: b.label == label)
+
+
+def _submit_filter(at: AppTest, label: str, value):
+    _selectbox(at, label).set_value(value)
+    _button(at, "Tampilkan").click()
+
+
+def _scenario(rng: random.Random, upload: bytes | None):
+    # daftar (aksi, fungsi yang menyiapkan interaksi sebelum at.run())
+    def pick(label):
+        return lambda at: _submit_filter(at, label, rng.choice(_selectbox(at, label).options))
+
+    steps = [
+        ("buka", lambda at: None),
+        ("rincian", lambda at: at.button(key="nav_detail").click()),
+        ("ganti_tahun", lambda at: _submit_filter(
+            at, "Tahun", int(rng.choice(_selectbox(at, "Tahun").options)))),
+        ("ganti_bulan", pick("Bulan")),
+        ("ganti_satuan", pick("Satuan (untuk grafik)")),
+        ("beranda", lambda at: at.button(key="nav_dash").click()),
+    ]
+    if upload is not None:
+        steps += [
+            ("mode_admin", lambda at: at.toggle(key="mode_umkm").set_value(False)),
+            ("buka_upload", lambda at: at.button(key="nav_upload").click()),
+            ("unggah", lambda at: at.file_uploader[0].upload("sintetis.xlsx", upload)),
+            ("simpan", lambda at: _button(at, "Konfirmasi & Simpan").click()),
+        ]
+    return steps
+
+
+def run_session(session: int, rounds: int, upload: bytes | None, seed: int, out: list):
+    rng = random.Random(seed + session)
+    at = AppTest.from_file(str(APP_PATH), default_timeout=RERUN_TIMEOUT)
+    for r in range(rounds):
+        for action, prepare in _scenario(rng, upload if r == 0 else None):
+            error, kind = None, None
+            t0 = time.perf_counter()
+            try:
+                try:
+                    prepare(at)
+                except HarnessError:
+                    raise
+                except Exception as e:
+                    # at.button(key=...) dkk. -> KeyError kalau widget tidak ada di halaman
+                    raise HarnessError(f"{type(e).__name__}: {e}") from e
+                at.run()
+                if at.exception:
+                    error, kind = str(at.exception[0].message), "app"
+                elif not at.main.children:
+                    # script berhenti sebelum elemen pertama tanpa exception = gagal compile/jalan di AppTest
+                    raise HarnessError("script tidak menghasilkan elemen apa pun")
+            except HarnessError as e:
+                error, kind = str(e), "harness"
+            except Exception as e:
+                error, kind = f"{type(e).__name__}: {e}", "app"
+            out.append({"session": session, "round": r, "action": action,
+                        "seconds": time.perf_counter() - t0, "error": error, "kind": kind})
+            if error:
+                return
+
+
+def run_level(n_sessions: int, rounds: int, upload_every: int, upload: bytes, seed: int) -> dict:
+    records = []
+    threads = [
+        threading.Thread(
+            target=run_session,
+            args=(i, rounds, upload if upload_every and i % upload_every == upload_every - 1 else None,
+                  seed, records),
+            name=f"loadtest-{i}",
+        )
+        for i in range(n_sessions)
+    ]
+    with _server_like_runtime(), _MemorySampler() as mem:
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - t0
+    return {"sessions": n_sessions, "wall_s": wall, "peak_rss_bytes": mem.peak, "records": records}
+
+
+def summarize(level: dict) -> pd.DataFrame:
+    df = pd.DataFrame(level["records"])
+    rows = []
+    for action, d in [("TOTAL", df)] + list(df.groupby("action", sort=False)):
+        ms = d["seconds"].to_numpy() * 1000
+        p = np.percentile(ms, PERCENTILES)
+        rows.append({"aksi": action, "rerun": len(ms), "gagal": int((d["kind"] == "app").sum()),
+                     "harness": int((d["kind"] == "harness").sum()),
+                     **{f"p{q}_ms": v for q, v in zip(PERCENTILES, p)}, "maks_ms": ms.max()})
+    return pd.DataFrame(rows)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Uji beban app.py dengan sesi AppTest paralel.")
+    parser.add_argument("--sessions", default=",".join(str(n) for n in DEFAULT_SESSIONS),
+                        help="tingkat konkurensi, dipisah koma")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="putaran skenario per sesi")
+    parser.add_argument("--upload-every", type=int, default=UPLOAD_EVERY,
+                        help="tiap sesi ke-k ikut mengunggah (0 = tanpa unggah)")
+    parser.add_argument("--upload-rows", type=int, default=UPLOAD_ROWS)
+    parser.add_argument("--cold", action="store_true", help="kosongkan st.cache_data sebelum tiap tingkat")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--out", help="file JSON hasil (bawaan: bench/results/loadtest-<waktu>.json)")
+    args = parser.parse_args(argv)
+
+    # peringatan bare mode / MemoryCacheStorageManager dari AppTest tidak relevan di sini
+    set_log_level("error")
+    upload = workbook_bytes(synthetic_frame(args.upload_rows, "nama_bulan", series=2, seed=args.seed))
+
+    levels, failed, harness = [], 0, 0
+    for n in [int(s) for s in args.sessions.split(",") if s.strip()]:
+        if args.cold:
+            st.cache_data.clear()
+        try:
+            level = run_level(n, args.rounds, args.upload_every, upload, args.seed)
+        except HarnessError as e:
+            print(f"harness: {e}")
+            return 2
+        table = summarize(level)
+        total = table.iloc[0]
+        failed += int(total["gagal"])
+        harness += int(total["harness"])
+        print(f"\n== {n} sesi: {int(total['rerun'])} rerun dalam {level['wall_s']:,.1f}s "
+              f"({total['rerun'] / level['wall_s']:,.1f} rerun/s), RSS puncak "
+              f"{level['peak_rss_bytes'] / 2**20:,.0f} MB")
+        print(table.to_string(index=False, float_format=lambda v: f"{v:,.1f}"))
+        errors = {(r["kind"], r["error"]) for r in level["records"] if r["error"]}
+        for kind, e in sorted(errors)[:5]:
+            print(f"   {'gagal' if kind == 'app' else 'harness'}: {e}")
+        levels.append({**{k: v for k, v in level.items() if k != "records"},
+                       "summary": table.to_dict(orient="records"), "records": level["records"]})
+
+    out = Path(args.out) if args.out else RESULTS_DIR / f"loadtest-{datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({
+        "meta": {"created": datetime.now().isoformat(timespec="seconds"), "rounds": args.rounds,
+                 "upload_every": args.upload_every, "cold": args.cold, **_versions()},
+        "levels": levels,
+    }, indent=1), encoding="utf-8")
+    print(f"\nHasil disimpan: {out}")
+    if harness:
+        print(f"{harness} kegagalan alat uji (bukan app.py); lihat baris 'harness' di atas.")
+    return 1 if failed else (2 if harness else 0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""Benchmark parse -> rollup -> agregasi -> grafik -> ekspor Excel di atas workbook sintetis.
+
+    python -m bench.run                                  # matriks bawaan, hasil ke bench/results/
+    python -m bench.run --sizes 100,1e6 --layouts tanggal --repeat 5
+    python -m bench.run --compare bench/results/lama.json           # jalankan lalu bandingkan
+    python -m bench.run --compare lama.json --current baru.json     # bandingkan dua file saja
+
+Tiap tahap diulang `--repeat` kali; yang dibandingkan median-nya. `--compare` keluar dengan kode 1
+kalau ada tahap yang melambat lebih dari `--threshold` (dan lebih dari MIN_DELTA_S detik).
+Tahap baca_<format> (tulis file tidak dihitung): xlsx/ods hanya untuk ukuran <= --max-xlsx-rows karena
+openpyxl/odfpy lambat; CSV untuk semua ukuran.
+"""
+import argparse
+import importlib.util
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from accuracy import accuracy_report
+from bench.generate import DEFAULT_SEED, EXCEL_MAX_ROWS, LAYOUTS, synthetic_frame, workbook_bytes
+from ingest import EXCEL_ENGINES, parse_excel_from_df, parse_workbook
+from report import (
+    UNITS,
+    add_unit_columns,
+    make_bar_month_chart,
+    make_line_month_chart,
+    month_table,
+    to_excel_bytes,
+)
+from rollup import build_rollups, year_month_matrix
+from units import unit_ratio
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_REPEAT = 3
+MAX_XLSX_ROWS = 20_000
+READ_FORMATS = ("xlsx", "ods", "csv")
+ACCURACY_WINDOW = 12
+THRESHOLD = 0.10
+MIN_DELTA_S = 0.002
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def _timed(fn, repeat: int):
+    runs, out = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        runs.append(time.perf_counter() - t0)
+    return out, runs
+
+
+def _monthly_tables(pred_month: pd.DataFrame) -> pd.DataFrame:
+    # tabel rincian (seperti halaman Rincian) untuk semua tahun, dengan kolom semua satuan
+    factors = {un: unit_ratio(UNITS, un) for un in UNITS}
+    years = np.unique(pred_month["tanggal"].dt.year.to_numpy())
+    tables = [month_table(pred_month, int(y)).assign(Tahun=int(y)) for y in years]
+    return add_unit_columns(pd.concat(tables, ignore_index=True), factors)
+
+
+def _chart_specs(pred_month: pd.DataFrame) -> int:
+    # spec Vega-Lite lengkap (to_dict = yang dikirim ke browser); kembalikan ukurannya
+    last_year = pred_month[pred_month["tanggal"].dt.year == pred_month["tanggal"].dt.year.max()]
+    charts = [make_line_month_chart(pred_month, "Sisir"), make_bar_month_chart(last_year, "Kg")]
+    return sum(len(json.dumps(c.to_dict())) for c in charts if c is not None)
+
+
+def run_case(rows: int, layout: str, bands: bool, repeat: int, max_xlsx_rows: int, seed: int) -> list[dict]:
+    raw = synthetic_frame(rows, layout, bands, seed=seed)
+    stages = []
+
+    # baca file lengkap per format (sniff + reader + parse); CSV tanpa batas baris
+    for fmt in READ_FORMATS:
+        too_big = rows > min(max_xlsx_rows, EXCEL_MAX_ROWS)
+        if fmt != "csv" and (too_big or importlib.util.find_spec(EXCEL_ENGINES[fmt]) is None):
+            continue
+        data = workbook_bytes(raw, fmt=fmt)
+        _, runs = _timed(lambda: parse_workbook(BytesIO(data), source="bench"), repeat)
+        stages.append((f"baca_{fmt}", runs, {"bytes": len(data)}))
+
+    (tidy, _, _), runs = _timed(lambda: parse_excel_from_df(raw), repeat)
+    stages.append(("parse", runs, {"tidy_rows": len(tidy)}))
+
+    rollups, runs = _timed(lambda: build_rollups(tidy), repeat)
+    stages.append(("rollup", runs, {"native": rollups["native"]}))
+
+    pred_month = rollups["M"][rollups["M"]["jenis"] == "Perkiraan"].reset_index(drop=True)
+    tbl, runs = _timed(lambda: (_monthly_tables(pred_month), year_month_matrix(pred_month))[0], repeat)
+    stages.append(("agregasi", runs, {"table_rows": len(tbl)}))
+
+    _, runs = _timed(lambda: accuracy_report(tidy, ACCURACY_WINDOW), repeat)
+    stages.append(("akurasi", runs, {}))
+
+    payload, runs = _timed(lambda: _chart_specs(pred_month), repeat)
+    stages.append(("grafik", runs, {"spec_bytes": payload}))
+
+    xlsx, runs = _timed(lambda: to_excel_bytes(tbl, sheet_name="Rincian"), repeat)
+    stages.append(("ekspor_excel", runs, {"bytes": len(xlsx)}))
+
+    return [
+        {"layout": layout, "bands": bands, "rows": rows, "stage": stage,
+         "median_s": float(np.median(runs)), "min_s": float(np.min(runs)), "runs": runs, **extra}
+        for stage, runs, extra in stages
+    ]
+
+
+def _versions() -> dict:
+    import altair
+    import openpyxl
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).parent, timeout=10).stdout.strip()
+    except Exception:
+        commit = ""
+    return {
+        "python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+        "altair": altair.__version__, "openpyxl": openpyxl.__version__,
+        "platform": platform.platform(), "commit": commit,
+    }
+
+
+def _case_key(r: dict) -> tuple:
+    return r["layout"], r["bands"], r["rows"], r["stage"]
+
+
+def compare(baseline: dict, current: dict, threshold: float = THRESHOLD) -> pd.DataFrame:
+    base = {_case_key(r): r["median_s"] for r in baseline["results"]}
+    rows = []
+    for r in current["results"]:
+        old = base.get(_case_key(r))
+        if old is None:
+            continue
+        new = r["median_s"]
+        rows.append({
+            "layout": r["layout"], "bands": r["bands"], "rows": r["rows"], "stage": r["stage"],
+            "lama_ms": old * 1000, "baru_ms": new * 1000, "rasio": new / old if old else np.nan,
+            "regresi": new > old * (1 + threshold) and new - old > MIN_DELTA_S,
+        })
+    return pd.DataFrame(rows)
+
+
+def _parse_sizes(text: str) -> list[int]:
+    return [int(float(s)) for s in text.split(",") if s.strip()]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pipeline prediksi pisang.")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="jumlah baris, dipisah koma (boleh 1e6)")
+    parser.add_argument("--layouts", default=",".join(LAYOUTS))
+    parser.add_argument("--bands", choices=["on", "off", "both"], default="on")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--max-xlsx-rows", type=int, default=MAX_XLSX_ROWS)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--out", help="file JSON hasil (bawaan: bench/results/<waktu>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON hasil lama untuk dibandingkan")
+    parser.add_argument("--current", help="pakai JSON ini sebagai hasil baru (tanpa menjalankan benchmark)")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="batas melambat, 0.10 = 10%%")
+    args = parser.parse_args(argv)
+
+    if args.current:
+        current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+    else:
+        layouts = [lay.strip() for lay in args.layouts.split(",") if lay.strip()]
+        bands = {"on": [True], "off": [False], "both": [True, False]}[args.bands]
+        results = []
+        for rows in _parse_sizes(args.sizes):
+            for layout in layouts:
+                for b in bands:
+                    t0 = time.perf_counter()
+                    case = run_case(rows, layout, b, args.repeat, args.max_xlsx_rows, args.seed)
+                    results += case
+                    summary = "  ".join(f"{r['stage']}={r['median_s'] * 1000:,.1f}ms" for r in case)
+                    print(f"{layout:<12} pita={'ya' if b else 'tidak':<5} {rows:>10,} baris  {summary}"
+                          f"  ({time.perf_counter() - t0:,.1f}s)", flush=True)
+
+        current = {
+            "meta": {"created": datetime.now().isoformat(timespec="seconds"), "seed": args.seed,
+                     "repeat": args.repeat, **_versions()},
+            "results": results,
+        }
+        out = Path(args.out) if args.out else RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(current, indent=1), encoding="utf-8")
+        print(f"Hasil disimpan: {out}")
+
+    if not args.compare:
+        return 0
+
+    baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+    cmp = compare(baseline, current, args.threshold)
+    if cmp.empty:
+        print("Tidak ada kasus yang sama dengan baseline.")
+        return 0
+    with pd.option_context("display.max_rows", None, "display.width", 160):
+        print(cmp.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+    n_reg = int(cmp["regresi"].sum())
+    print(f"{n_reg} tahap melambat > {args.threshold:.0%} dibanding {args.compare}")
+    return 1 if n_reg else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,417 @@
+"""Universal Excel parser: file prediksi (format bebas) -> data rapi (tidy).
+
+Kolom tanggal dikenali otomatis (kolom tanggal, atau kolom tahun + bulan, termasuk nama bulan
+Indonesia). Format file dikenali dari isi (magic bytes), bukan ekstensi: xlsx, xls, ods, atau CSV.
+Semua sheet di workbook dibaca paralel lalu digabung jadi satu dataset.
+"""
+import csv
+import hashlib
+import importlib.util
+import math
+import re
+import zipfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import metrics
+
+ID_MONTHS = {
+    "januari": 1, "jan": 1, "jan.": 1,
+    "februari": 2, "feb": 2,
+    "maret": 3, "mar": 3,
+    "april": 4, "apr": 4,
+    "mei": 5,
+    "juni": 6, "jun": 6,
+    "juli": 7, "jul": 7,
+    "agustus": 8, "agu": 8, "aug": 8,
+    "september": 9, "sep": 9,
+    "oktober": 10, "okt": 10,
+    "november": 11, "nov": 11,
+    "desember": 12, "des": 12, "dec": 12,
+}
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df.columns = [
+        re.sub(r"\s+", "_", str(c).strip()).lower()
+        for c in df.columns
+    ]
+    return df
+
+DATE_KEYWORDS = ["tanggal", "tgl", "date", "waktu", "period", "periode", "bulan_tahun", "bulan-tahun", "bulan_thn"]
+
+def detect_date_column(df: pd.DataFrame):
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            if df[col].notna().sum() >= max(3, len(df) * 0.5):
+                return col, df[col]
+
+    for col in df.columns:
+        if any(k in col for k in DATE_KEYWORDS):
+            parsed = pd.to_datetime(df[col], errors="coerce", dayfirst=True)
+            if parsed.notna().sum() >= max(3, len(df) * 0.5):
+                return col, parsed
+    return None, None
+
+def detect_year_month(df: pd.DataFrame):
+    year_col, month_col = None, None
+    for col in df.columns:
+        if any(k in col for k in ["tahun", "year", "thn", "th"]):
+            year_col = col
+        if any(k in col for k in ["bulan", "month", "bln", "mon"]):
+            month_col = col
+    return year_col, month_col
+
+def parse_year_month_to_date(df: pd.DataFrame, year_col: str, month_col: str) -> pd.Series:
+    y = pd.to_numeric(df[year_col], errors="coerce")
+    if (y < 100).sum() > 0 and (y < 100).sum() >= len(y) * 0.5:
+        y = y.apply(lambda v: 2000 + v if pd.notna(v) else v)
+
+    months_raw = df[month_col]
+    m = pd.to_numeric(months_raw, errors="coerce")
+    mask = m.isna() & months_raw.notna()
+    if mask.any():
+        def map_month(x):
+            if pd.isna(x): return math.nan
+            s = str(x).strip().lower()
+            s2 = re.sub(r"[^\w]+$", "", s)
+            return ID_MONTHS.get(s2, math.nan)
+        m[mask] = months_raw[mask].map(map_month)
+
+    return pd.to_datetime({"year": y, "month": m, "day": 1}, errors="coerce")
+
+DEFAULT_SERIES = "Utama"
+SERIES_NOISE_TOKENS = {"ci", "pi", "bound", "nilai", "value", "kg"}
+# galat baku / simpangan (mis. `mean_se` dari statsmodels summary_frame) bukan seri kebutuhan
+STDERR_TOKENS = {"se", "stderr", "std", "sd"}
+
+def series_key(col: str, keywords: list[str]) -> str:
+    # "prediksi_mean_coklat" -> "Coklat"; kolom tanpa nama produk/outlet -> DEFAULT_SERIES
+    tokens = [
+        t for t in re.split(r"[_\-]+", col)
+        if t and t not in SERIES_NOISE_TOKENS and not any(k in t for k in keywords)
+    ]
+    return " ".join(tokens).title() or DEFAULT_SERIES
+
+def series_frame(df_base: pd.DataFrame, value_col: str, jenis: str, seri: str, low_col=None, up_col=None) -> pd.DataFrame:
+    keep = df_base[value_col].notna().to_numpy()
+    d = df_base.loc[keep]
+    return pd.DataFrame({
+        "tanggal": d["tanggal"].to_numpy(),
+        "jenis": jenis,
+        "seri": seri,
+        "nilai": d[value_col].to_numpy(dtype=float),
+        "min": d[low_col].to_numpy(dtype=float) if low_col else np.full(len(d), np.nan),
+        "max": d[up_col].to_numpy(dtype=float) if up_col else np.full(len(d), np.nan),
+    })
+
+def parse_excel_from_df(df_raw: pd.DataFrame):
+    df = normalize_columns(df_raw)
+
+    date_col, date_series = detect_date_column(df)
+    if date_series is None:
+        year_col, month_col = detect_year_month(df)
+        if year_col and month_col:
+            date_series = parse_year_month_to_date(df, year_col, month_col)
+            date_col = "tanggal"
+        else:
+            best_col, best_non_na, best_parsed = None, 0, None
+            for col in df.columns:
+                parsed = pd.to_datetime(df[col], errors="coerce", dayfirst=True)
+                non_na = parsed.notna().sum()
+                if non_na > best_non_na:
+                    best_non_na, best_col, best_parsed = non_na, col, parsed
+            if best_parsed is not None and best_non_na >= max(3, len(df) * 0.5):
+                date_col, date_series = best_col, best_parsed
+            else:
+                raise ValueError(
+                    "Tidak bisa mengenali kolom tanggal/bulan-tahun.\n"
+                    "Pastikan ada kolom tanggal, atau kolom bulan dan tahun."
+                )
+
+    df_base = df.copy()
+    df_base["tanggal"] = pd.to_datetime(date_series, errors="coerce")
+    df_base = df_base[df_base["tanggal"].notna()].copy().sort_values("tanggal")
+
+    numeric_cols = [
+        c for c in df_base.columns
+        if c not in ["tanggal", date_col] and pd.api.types.is_numeric_dtype(df_base[c])
+    ]
+
+    forecast_keywords = ["mean", "forecast", "prediksi"]
+    lower_keywords = ["lower", "bawah", "min"]
+    upper_keywords = ["upper", "atas", "max"]
+    lower_cols = [c for c in numeric_cols if any(k in c for k in lower_keywords)]
+    upper_cols = [c for c in numeric_cols if any(k in c for k in upper_keywords)]
+    forecast_cols = [
+        c for c in numeric_cols
+        if any(k in c for k in forecast_keywords) and c not in lower_cols + upper_cols
+        and not STDERR_TOKENS & set(re.split(r"[_\-]+", c))
+    ]
+
+    actual_keywords = ["actual", "aktual", "realisasi", "pemakaian", "kebutuhan", "volume", "qty", "jumlah"]
+    actual_cols = [c for c in numeric_cols if any(k in c for k in actual_keywords)]
+    fitted_cols = [c for c in numeric_cols if "fitted" in c]
+
+    frames = []
+
+    # Aktual (opsional)
+    for col in actual_cols:
+        frames.append(series_frame(df_base, col, "Aktual", series_key(col, actual_keywords)))
+
+    # Perkiraan (prediksi) - satu seri per kolom perkiraan, min/maks dipasangkan lewat nama seri
+    # ("mean_ci_lower" -> kunci "Utama", sama dengan "mean")
+    lower_by_series = {series_key(c, lower_keywords + forecast_keywords): c for c in reversed(lower_cols)}
+    upper_by_series = {series_key(c, upper_keywords + forecast_keywords): c for c in reversed(upper_cols)}
+    forecast_series = [series_key(c, forecast_keywords) for c in forecast_cols]
+    # satu seri tanpa pasangan + tepat satu pasang min/maks tanpa pemilik -> pasangkan keduanya
+    unbanded = [s for s in forecast_series if s not in lower_by_series and s not in upper_by_series]
+    spare_low = [c for s, c in lower_by_series.items() if s not in forecast_series]
+    spare_up = [c for s, c in upper_by_series.items() if s not in forecast_series]
+    if len(unbanded) == 1 and len(spare_low) == 1 and len(spare_up) == 1:
+        lower_by_series[unbanded[0]], upper_by_series[unbanded[0]] = spare_low[0], spare_up[0]
+    for col, seri in zip(forecast_cols, forecast_series):
+        low_col = lower_by_series.get(seri)
+        up_col = upper_by_series.get(seri)
+        if len(forecast_cols) == 1:
+            low_col = low_col or (lower_cols[0] if lower_cols else None)
+            up_col = up_col or (upper_cols[0] if upper_cols else None)
+        frames.append(series_frame(df_base, col, "Perkiraan", seri, low_col, up_col))
+
+    # Fitted (in-sample, opsional) - untuk cek akurasi di bulan yang punya data aktual
+    for col in fitted_cols:
+        frames.append(series_frame(df_base, col, "Fitted", series_key(col, ["fitted"])))
+
+    # Fallback
+    if not any(len(f) for f in frames) and numeric_cols:
+        frames = [series_frame(df_base, numeric_cols[0], "Perkiraan", DEFAULT_SERIES)]
+
+    tidy = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if tidy.empty:
+        raise ValueError("File terbaca, tapi tidak menemukan kolom angka untuk ditampilkan.")
+
+    tidy["tanggal"] = pd.to_datetime(tidy["tanggal"])
+    # seri disimpan sebagai kode kategori (urutan = urutan kolom perkiraan di file)
+    series_order = list(dict.fromkeys(forecast_series + tidy["seri"].tolist()))
+    tidy["seri"] = pd.Categorical(tidy["seri"], categories=series_order)
+    tidy = tidy.sort_values(["tanggal", "jenis"], kind="stable").reset_index(drop=True)
+
+    df_actual = tidy[tidy["jenis"] == "Aktual"].copy()
+    df_pred = tidy[tidy["jenis"] == "Perkiraan"].copy()
+    return tidy, df_actual, df_pred
+
+def dataset_version(tidy: pd.DataFrame) -> str:
+    # sidik jari isi data -> kunci cache per versi dataset (bukan hash DataFrame tiap rerun)
+    h = pd.util.hash_pandas_object(tidy, index=False).to_numpy()
+    return hashlib.sha1(h.tobytes()).hexdigest()[:12]
+
+# =========================================================
+# SERI (produk/outlet)
+# =========================================================
+ALL_SERIES = "Semua Produk/Outlet"
+
+def series_options(tidy: pd.DataFrame) -> list[str]:
+    series = list(tidy["seri"].cat.categories)
+    return ([ALL_SERIES] + series) if len(series) > 1 else series
+
+def series_view(tidy: pd.DataFrame, seri: str):
+    if seri == ALL_SERIES:
+        # total semua seri per bulan; rentang min/maks digabung sebagai akar jumlah kuadrat lebar
+        # (seri dianggap independen), hanya kalau semua seri punya rentang
+        d = tidy.assign(lo2=(tidy["nilai"] - tidy["min"]) ** 2, hi2=(tidy["max"] - tidy["nilai"]) ** 2)
+        g = d.groupby(["tanggal", "jenis"], sort=True)
+        view = g["nilai"].sum(min_count=1).to_frame()
+        n = g["nilai"].count()
+        view["min"] = (view["nilai"] - np.sqrt(g["lo2"].sum())).where(g["min"].count() == n)
+        view["max"] = (view["nilai"] + np.sqrt(g["hi2"].sum())).where(g["max"].count() == n)
+        view = view.reset_index()
+        view.insert(2, "seri", pd.Categorical([ALL_SERIES] * len(view)))
+    else:
+        code = tidy["seri"].cat.categories.get_loc(seri)
+        view = tidy[tidy["seri"].cat.codes.to_numpy() == code].reset_index(drop=True)
+    return view, view[view["jenis"] == "Aktual"].copy(), view[view["jenis"] == "Perkiraan"].copy()
+
+# =========================================================
+# FORMAT FILE (dikenali dari magic bytes, lalu pakai pembaca tercepat yang tersedia)
+# =========================================================
+FORMAT_LABELS = {"xlsx": "Excel (.xlsx)", "xls": "Excel 97-2003 (.xls)", "ods": "OpenDocument (.ods)", "csv": "CSV"}
+UPLOAD_TYPES = ["xlsx", "xls", "ods", "csv"]
+EXCEL_ENGINES = {"xlsx": "openpyxl", "xls": "xlrd", "ods": "odf"}
+ENGINE_PACKAGES = {"openpyxl": "openpyxl", "xlrd": "xlrd", "odf": "odfpy"}
+
+ZIP_MAGIC = b"PK\x03\x04"
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+ODS_MIMETYPE = b"application/vnd.oasis.opendocument.spreadsheet"
+CSV_SAMPLE_BYTES = 64 * 1024
+CSV_DELIMITERS = ",;\t|"
+# angka format Indonesia: 1.234.567,5 atau 1234,5 (titik = ribuan, koma = desimal)
+ID_NUMBER = r"-?(?:\d{1,3}(?:\.\d{3})+|\d+)(?:,\d+)?"
+
+def sniff_format(data: bytes) -> str:
+    if data.startswith(ZIP_MAGIC):
+        try:
+            with zipfile.ZipFile(BytesIO(data)) as z:
+                names = set(z.namelist())
+                if "mimetype" in names and z.read("mimetype").strip() == ODS_MIMETYPE:
+                    return "ods"
+                if "xl/workbook.xml" in names:
+                    return "xlsx"
+        except zipfile.BadZipFile:
+            raise ValueError("File rusak atau tidak lengkap (ZIP tidak bisa dibuka).") from None
+        raise ValueError("File ZIP ini bukan workbook Excel (.xlsx) atau OpenDocument (.ods).")
+    if data.startswith(OLE_MAGIC):
+        return "xls"
+    if b"\x00" in data[:CSV_SAMPLE_BYTES]:
+        raise ValueError("Format file tidak dikenali. Gunakan .xlsx, .xls, .ods, atau .csv.")
+    return "csv"
+
+def _require_engine(fmt: str) -> str:
+    engine = EXCEL_ENGINES[fmt]
+    if importlib.util.find_spec(engine) is None:
+        raise ValueError(
+            f"Membaca {FORMAT_LABELS[fmt]} butuh paket '{ENGINE_PACKAGES[engine]}' "
+            f"(pip install {ENGINE_PACKAGES[engine]}), atau simpan ulang file sebagai .xlsx/.csv."
+        )
+    return engine
+
+def read_csv_fast(data: bytes) -> pd.DataFrame:
+    head = data[:CSV_SAMPLE_BYTES]
+    try:
+        sample = head.decode("utf-8-sig")
+        encoding = "utf-8-sig"
+    except UnicodeDecodeError as e:
+        # potongan sampel bisa memutus karakter multi-byte di ujungnya
+        if e.start < len(head) - 4:
+            sample, encoding = head.decode("latin-1"), "latin-1"
+        else:
+            sample, encoding = head[:e.start].decode("utf-8-sig"), "utf-8-sig"
+
+    try:
+        sep = csv.Sniffer().sniff(sample.split("\n", 1)[0], delimiters=CSV_DELIMITERS).delimiter
+    except csv.Error:
+        sep = ","
+    # ekspor Excel berbahasa Indonesia: pemisah ";" dengan desimal koma (1.234,5)
+    decimal_comma = sep != "," and re.search(r"\d,\d", sample) is not None
+
+    if not decimal_comma and encoding != "latin-1" and importlib.util.find_spec("pyarrow") is not None:
+        try:
+            return pd.read_csv(BytesIO(data), sep=sep, engine="pyarrow")
+        except Exception:
+            pass  # baris tidak rata dll. -> pembaca C pandas lebih toleran
+    if not decimal_comma:
+        return pd.read_csv(BytesIO(data), sep=sep, engine="c", encoding=encoding)
+
+    # desimal koma: baca sebagai teks lalu ubah hanya kolom angka. thousands="." global juga memakan titik
+    # di tanggal (01.02.2025 -> 1022025), jadi kolom tanggal dan kolom yang bukan angka dibiarkan teks
+    df = pd.read_csv(BytesIO(data), sep=sep, engine="c", encoding=encoding, dtype=str)
+    for col in df.columns:
+        if any(k in str(col).strip().lower() for k in DATE_KEYWORDS):
+            continue
+        values = df[col].str.strip()
+        filled = values.notna() & (values != "")
+        if filled.any() and values[filled].str.fullmatch(ID_NUMBER).all():
+            df[col] = pd.to_numeric(
+                values.str.replace(".", "", regex=False).str.replace(",", ".", regex=False), errors="coerce"
+            )
+    return df
+
+def sheet_names(data: bytes, fmt: str) -> list[str]:
+    if fmt == "csv":
+        return ["CSV"]
+    with pd.ExcelFile(BytesIO(data), engine=_require_engine(fmt)) as xls:
+        return xls.sheet_names
+
+def read_sheet(data: bytes, fmt: str, sheet_name: str) -> pd.DataFrame:
+    if fmt == "csv":
+        return read_csv_fast(data)
+    return pd.read_excel(BytesIO(data), sheet_name=sheet_name, engine=EXCEL_ENGINES[fmt])
+
+# =========================================================
+# MULTI-SHEET (paralel per sheet)
+# =========================================================
+MAX_SHEET_WORKERS = 8
+# sheet per tahun ("2025", "Tahun 2025", "FY2025") tetap satu seri, bukan produk/outlet baru
+YEAR_SHEET = re.compile(r"(?<!\d)(?:19|20)\d{2}(?!\d)")
+
+def _read_bytes(file_path_or_buffer) -> bytes:
+    if hasattr(file_path_or_buffer, "getvalue"):
+        return file_path_or_buffer.getvalue()
+    if hasattr(file_path_or_buffer, "read"):
+        return file_path_or_buffer.read()
+    return Path(file_path_or_buffer).read_bytes()
+
+def _parse_sheet(data: bytes, sheet_name: str, fmt: str = "xlsx") -> dict:
+    # tiap thread membuka workbook sendiri: objek openpyxl/xlrd tidak aman dipakai bersama antar-thread
+    t0 = time.perf_counter()
+    try:
+        df_raw = read_sheet(data, fmt, sheet_name)
+        tidy, _, _ = parse_excel_from_df(df_raw)
+        return {"sheet": sheet_name, "tidy": tidy, "rows": len(tidy), "error": None,
+                "seconds": time.perf_counter() - t0}
+    except Exception as e:
+        return {"sheet": sheet_name, "tidy": None, "rows": 0, "error": str(e),
+                "seconds": time.perf_counter() - t0}
+
+def combine_sheets(results: list[dict]):
+    ok = [r for r in results if r["tidy"] is not None]
+    if not ok:
+        raise ValueError(results[0]["error"] if results else "File tidak punya sheet.")
+
+    frames = []
+    for r in ok:
+        tidy = r["tidy"].copy()
+        seri = tidy["seri"].astype(str)
+        # sheet per outlet/produk: seri bawaan diganti nama sheet; sheet per tahun tetap satu seri
+        if len(ok) > 1 and not YEAR_SHEET.search(str(r["sheet"])):
+            seri = seri.where(seri != DEFAULT_SERIES, str(r["sheet"]).strip())
+        tidy["seri"] = seri
+        frames.append(tidy)
+
+    tidy = pd.concat(frames, ignore_index=True)
+    series_order = list(dict.fromkeys(tidy["seri"].tolist()))
+    tidy["seri"] = pd.Categorical(tidy["seri"], categories=series_order)
+    tidy = tidy.sort_values(["tanggal", "jenis"], kind="stable").reset_index(drop=True)
+
+    df_actual = tidy[tidy["jenis"] == "Aktual"].copy()
+    df_pred = tidy[tidy["jenis"] == "Perkiraan"].copy()
+    return tidy, df_actual, df_pred
+
+def sheet_report(results: list[dict], fmt: str = "xlsx") -> pd.DataFrame:
+    return pd.DataFrame({
+        "Sheet": [r["sheet"] for r in results],
+        "Format": FORMAT_LABELS[fmt],
+        "Baris": [r["rows"] for r in results],
+        "Waktu_ms": [r["seconds"] * 1000 for r in results],
+        "Status": ["OK" if r["error"] is None else f"Gagal: {r['error']}" for r in results],
+    })
+
+def parse_workbook(file_path_or_buffer, source: str = "upload"):
+    t0 = time.perf_counter()
+    data = _read_bytes(file_path_or_buffer)
+    fmt = sniff_format(data)
+    names = sheet_names(data, fmt)
+
+    if len(names) <= 1:
+        results = [_parse_sheet(data, name, fmt) for name in names]
+    else:
+        with ThreadPoolExecutor(max_workers=min(MAX_SHEET_WORKERS, len(names))) as pool:
+            results = list(pool.map(lambda name: _parse_sheet(data, name, fmt), names))
+
+    errors = sum(r["error"] is not None for r in results)
+    try:
+        tidy, df_actual, df_pred = combine_sheets(results)
+    except ValueError:
+        metrics.observe_parse(source, time.perf_counter() - t0, 0, errors, fmt)
+        raise
+    seconds = time.perf_counter() - t0
+    metrics.observe_parse(source, seconds, len(tidy), errors, fmt)
+    # waktu total (sniff + semua sheet + gabung), bukan waktu sheet terlama
+    return tidy, df_actual, df_pred, sheet_report(results, fmt), seconds
+
+def parse_excel(file_path_or_buffer, source: str = "upload"):
+    return parse_workbook(file_path_or_buffer, source)[:3]
@@ -0,0 +1,228 @@
+"""Metrik runtime (format teks Prometheus) untuk parse, rerun, dan cache.
+
+Satu registry per proses (dipakai bersama semua sesi Streamlit). Ekspor lewat salah satu:
+- PISANG_METRICS_FILE=/path/metrics.prom  -> ditulis ulang (atomic) paling cepat tiap WRITE_INTERVAL detik,
+  cocok untuk textfile collector node_exporter
+- PISANG_METRICS_PORT=9464                -> endpoint http://127.0.0.1:9464/metrics
+
+Tanpa dependensi tambahan (tidak butuh prometheus_client).
+"""
+import bisect
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+PARSE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RERUN_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0)
+WRITE_INTERVAL = 5.0
+
+_LOG = logging.getLogger(__name__)
+
+_HELP = {
+    "pisang_parse_duration_seconds": ("histogram", "Durasi parse file per format (baca + parse_excel_from_df)."),
+    "pisang_rows_ingested_total": ("counter", "Jumlah baris tidy hasil parse."),
+    "pisang_parse_errors_total": ("counter", "Jumlah sheet yang gagal diparse."),
+    "pisang_rerun_duration_seconds": ("histogram", "Durasi satu rerun script per halaman."),
+    "pisang_dataset_bytes": ("gauge", "Memori data tidy per versi dataset."),
+    "pisang_cache_calls_total": ("counter", "Panggilan fungsi ber-st.cache_data."),
+    "pisang_cache_misses_total": ("counter", "Panggilan yang harus menghitung ulang (cache miss)."),
+}
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items())) + "}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._hists = {}
+        self._write_lock = threading.Lock()
+        self._last_write = 0.0
+        self._write_failed = False
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels):
+        with self._lock:
+            self._gauges[(name, tuple(sorted(labels.items())))] = float(value)
+
+    def remove(self, name: str, **labels):
+        with self._lock:
+            self._gauges.pop((name, tuple(sorted(labels.items()))), None)
+
+    def observe(self, name: str, value: float, buckets=RERUN_BUCKETS, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            h = self._hists.get(key)
+            if h is None:
+                h = self._hists[key] = {"buckets": tuple(buckets), "counts": [0] * len(buckets), "sum": 0.0, "n": 0}
+            i = bisect.bisect_left(h["buckets"], value)
+            if i < len(h["counts"]):
+                h["counts"][i] += 1
+            h["sum"] += value
+            h["n"] += 1
+
+    def render(self) -> str:
+        _drain_released_datasets()
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            hists = {k: dict(v, counts=list(v["counts"])) for k, v in self._hists.items()}
+
+        lines = []
+        for name, (kind, text) in _HELP.items():
+            series = [(k, v) for k, v in {**counters, **gauges, **hists}.items() if k[0] == name]
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (_, labels), v in sorted(series, key=lambda kv: kv[0][1]):
+                labels = dict(labels)
+                if kind != "histogram":
+                    lines.append(f"{name}{_labels(labels)} {v:g}")
+                    continue
+                cum = 0
+                for le, c in zip(v["buckets"], v["counts"]):
+                    cum += c
+                    lines.append(f"{name}_bucket{_labels({**labels, 'le': f'{le:g}'})} {cum}")
+                lines.append(f"{name}_bucket{_labels({**labels, 'le': '+Inf'})} {v['n']}")
+                lines.append(f"{name}_sum{_labels(labels)} {v['sum']:g}")
+                lines.append(f"{name}_count{_labels(labels)} {v['n']}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path, force: bool = False):
+        with self._write_lock:
+            now = time.monotonic()
+            if not force and now - self._last_write < WRITE_INTERVAL:
+                return
+            self._last_write = now
+            if self._write_failed:
+                return
+            path = Path(path)
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            try:
+                tmp.write_text(self.render(), encoding="utf-8")
+                os.replace(tmp, path)
+            except OSError as e:
+                # folder tidak ada / tidak bisa ditulis: dicatat sekali, metrik tidak boleh membuat halaman gagal
+                self._write_failed = True
+                _LOG.warning("File metrik %s tidak bisa ditulis: %s", path, e)
+                try:
+                    tmp.unlink(missing_ok=True)
+                except OSError:
+                    pass
+
+
+REGISTRY = MetricsRegistry()
+_server_lock = threading.Lock()
+_server = None
+_server_failed = False
+
+# dataset upload: gauge hanya selama objek datanya masih dipegang (session_state); jumlah objek per versi
+_dataset_lock = threading.Lock()
+_dataset_refs = {}
+_released_datasets = deque()
+
+
+def observe_parse(source: str, seconds: float, rows: int, errors: int = 0, fmt: str = "xlsx"):
+    REGISTRY.observe("pisang_parse_duration_seconds", seconds, PARSE_BUCKETS, source=source, format=fmt)
+    REGISTRY.inc("pisang_rows_ingested_total", rows, source=source, format=fmt)
+    if errors:
+        REGISTRY.inc("pisang_parse_errors_total", errors, source=source, format=fmt)
+
+
+def observe_rerun(page: str, seconds: float):
+    REGISTRY.observe("pisang_rerun_duration_seconds", seconds, RERUN_BUCKETS, page=page)
+
+
+def set_dataset_bytes(version: str, nbytes: int):
+    # versi yang dipegang seumur proses (data bawaan)
+    REGISTRY.set("pisang_dataset_bytes", nbytes, version=version)
+
+
+def track_dataset(version: str, tidy):
+    # gauge dihapus setelah objek `tidy` terakhir untuk versi ini dibuang (sesi ditutup / data diganti)
+    _drain_released_datasets()
+    with _dataset_lock:
+        _dataset_refs[version] = _dataset_refs.get(version, 0) + 1
+        REGISTRY.set("pisang_dataset_bytes", int(tidy.memory_usage(deep=True).sum()), version=version)
+    # callback bisa jalan di tengah GC di thread mana pun: hanya antre, tanpa lock
+    weakref.finalize(tidy, _released_datasets.append, version)
+
+
+def _drain_released_datasets():
+    while _released_datasets:
+        version = _released_datasets.popleft()
+        with _dataset_lock:
+            left = _dataset_refs.get(version, 0) - 1
+            if left > 0:
+                _dataset_refs[version] = left
+                continue
+            _dataset_refs.pop(version, None)
+            REGISTRY.remove("pisang_dataset_bytes", version=version)
+
+
+def cache_call(function: str):
+    REGISTRY.inc("pisang_cache_calls_total", function=function)
+
+
+def cache_miss(function: str):
+    REGISTRY.inc("pisang_cache_misses_total", function=function)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_http_server(port: int, addr: str = "127.0.0.1"):
+    # sekali per proses; rerun berikutnya tidak membuka port lagi. Port gagal dibuka (mis. sudah dipakai)
+    # dicatat sekali lalu dilewati: metrik tidak boleh membuat halaman gagal
+    global _server, _server_failed
+    with _server_lock:
+        if _server is None and not _server_failed:
+            try:
+                _server = ThreadingHTTPServer((addr, int(port)), _MetricsHandler)
+            except OSError as e:
+                _server_failed = True
+                _LOG.warning("Endpoint metrik di %s:%s tidak bisa dibuka: %s", addr, port, e)
+                return None
+            threading.Thread(target=_server.serve_forever, name="pisang-metrics", daemon=True).start()
+    return _server
+
+
+def export_from_env():
+    port = os.environ.get("PISANG_METRICS_PORT")
+    if port:
+        start_http_server(int(port))
+    path = os.environ.get("PISANG_METRICS_FILE")
+    if path:
+        REGISTRY.write_textfile(path)
@@ -0,0 +1,122 @@
+"""Timer per bagian script untuk panel profil rerun (mode Admin).
+
+Saat panel mati, `section()` mengembalikan satu context kosong yang sama dan penghitung cache
+langsung keluar, jadi biayanya hanya satu pemanggilan fungsi per bagian.
+"""
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+
+import numpy as np
+import pandas as pd
+
+HISTORY_SIZE = 30
+_NULL_SECTION = nullcontext()
+
+
+class _Section:
+    __slots__ = ("prof", "name", "t0")
+
+    def __init__(self, prof, name: str):
+        self.prof = prof
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        t1 = time.perf_counter()
+        self.prof.run["sections"].append((self.name, self.t0 - self.prof.t0, t1 - self.t0))
+        return False
+
+
+class Profiler:
+    def __init__(self, enabled: bool, history: deque | None = None):
+        self.enabled = enabled
+        self.history = history if history is not None else deque(maxlen=HISTORY_SIZE)
+        self.t0 = time.perf_counter()
+        self.run = {"page": "", "sections": [], "cache_calls": {}, "cache_misses": {}, "payload": {}, "total": None}
+        if enabled:
+            # langsung masuk riwayat, supaya rerun yang berhenti di st.stop() tetap tercatat
+            self.history.append(self.run)
+
+    def set_page(self, page: str):
+        self.run["page"] = page
+
+    def section(self, name: str):
+        return _Section(self, name) if self.enabled else _NULL_SECTION
+
+    def cache_call(self, name: str):
+        if self.enabled:
+            self.run["cache_calls"][name] = self.run["cache_calls"].get(name, 0) + 1
+
+    def cache_miss(self, name: str):
+        if self.enabled:
+            self.run["cache_misses"][name] = self.run["cache_misses"].get(name, 0) + 1
+
+    def chart_payload(self, name: str, chart):
+        # ukuran spec Vega-Lite yang dikirim ke browser (hanya dihitung saat panel aktif)
+        if self.enabled and chart is not None:
+            self.run["payload"][name] = len(json.dumps(chart.to_dict()).encode("utf-8"))
+
+    def finish(self):
+        if self.enabled:
+            self.run["total"] = time.perf_counter() - self.t0
+
+
+def run_total(run: dict) -> float:
+    if run["total"] is not None:
+        return run["total"]
+    return max((start + dur for _, start, dur in run["sections"]), default=0.0)
+
+
+def waterfall_frame(run: dict) -> pd.DataFrame:
+    return pd.DataFrame({
+        "bagian": [name for name, _, _ in run["sections"]],
+        "mulai_ms": [start * 1000 for _, start, _ in run["sections"]],
+        "selesai_ms": [(start + dur) * 1000 for _, start, dur in run["sections"]],
+        "durasi_ms": [dur * 1000 for _, _, dur in run["sections"]],
+    }).sort_values("mulai_ms").reset_index(drop=True)
+
+
+def section_percentiles(runs) -> pd.DataFrame:
+    cols = ["Bagian", "Jumlah", "p50_ms", "p90_ms", "p99_ms", "Maks_ms"]
+    rows = [(name, dur) for run in runs for name, _, dur in run["sections"]]
+    rows += [("TOTAL RERUN", run_total(run)) for run in runs]
+    if not rows:
+        return pd.DataFrame(columns=cols)
+    names, inv = np.unique([r[0] for r in rows], return_inverse=True)
+    durs = np.array([r[1] for r in rows]) * 1000
+    out = []
+    for i, name in enumerate(names):
+        d = durs[inv == i]
+        p50, p90, p99 = np.percentile(d, [50, 90, 99])
+        out.append((name, len(d), p50, p90, p99, d.max()))
+    return pd.DataFrame(out, columns=cols).sort_values("p50_ms", ascending=False).reset_index(drop=True)
+
+
+def cache_hit_rates(runs) -> pd.DataFrame:
+    calls, misses = {}, {}
+    for run in runs:
+        for name, n in run["cache_calls"].items():
+            calls[name] = calls.get(name, 0) + n
+        for name, n in run["cache_misses"].items():
+            misses[name] = misses.get(name, 0) + n
+    names = sorted(calls)
+    n_calls = np.array([calls[n] for n in names], dtype=float)
+    n_miss = np.array([misses.get(n, 0) for n in names], dtype=float)
+    return pd.DataFrame({
+        "Fungsi": names,
+        "Panggilan": n_calls.astype(int),
+        "Miss": n_miss.astype(int),
+        "Hit_%": (1 - n_miss / np.maximum(n_calls, 1)) * 100,
+    })
+
+
+def payload_frame(run: dict) -> pd.DataFrame:
+    return pd.DataFrame({
+        "Grafik": list(run["payload"]),
+        "Ukuran_KB": [b / 1024 for b in run["payload"].values()],
+    })
@@ -0,0 +1,345 @@
+"""Pembuat tabel, grafik Altair, dan ekspor Excel - tanpa Streamlit.
+
+Dipakai app.py dan bisa diimpor langsung (benchmark, skrip) tanpa menjalankan script Streamlit.
+Semua angka masuk dalam kg; satuan lain dari registry `UNITS` (satuan.json, lihat units.py).
+"""
+import math
+from io import BytesIO
+from pathlib import Path
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+from ingest import ALL_SERIES
+from units import BASE_UNIT, load_unit_registry, unit_names, unit_ratio, weighted_ratio
+
+ID_MONTH_NAMES = {
+    1: "Januari", 2: "Februari", 3: "Maret", 4: "April",
+    5: "Mei", 6: "Juni", 7: "Juli", 8: "Agustus",
+    9: "September", 10: "Oktober", 11: "November", 12: "Desember",
+}
+
+
+def month_name_id(m: int) -> str:
+    return ID_MONTH_NAMES.get(int(m), str(m))
+
+
+def fmt_int(v: float) -> str:
+    try:
+        return f"{float(v):,.0f}"
+    except Exception:
+        return "—"
+
+
+def fmt_pct(v: float) -> str:
+    try:
+        v = float(v)
+    except Exception:
+        return "—"
+    return f"{v:,.1f}%" if math.isfinite(v) else "—"
+
+
+# patokan UMKM: 450 sisir = 250 kg; rasio per varietas bisa diatur di satuan.json
+UNITS = load_unit_registry(Path(__file__).parent / "satuan.json")
+UNIT_NAMES = unit_names(UNITS)
+KG_COLS = ["Perkiraan_kg", "Min_kg", "Maks_kg"]
+
+
+def unit_suffix(unit_choice: str) -> str:
+    return UNITS.get(unit_choice, UNITS[BASE_UNIT])["suffix"]
+
+
+def view_unit_factors(df_pred: pd.DataFrame, seri: str, year: int) -> dict:
+    # satu rasio per satuan untuk tampilan ini; gabungan seri = rasio berbobot kg per varietas
+    if seri != ALL_SERIES:
+        return {un: unit_ratio(UNITS, un, seri) for un in UNIT_NAMES}
+    d = df_pred[df_pred["tanggal"].dt.year == year]
+    codes = d["seri"].cat.codes.to_numpy()
+    cats = list(d["seri"].cat.categories)
+    return {un: weighted_ratio(UNITS, un, d["nilai"].to_numpy(), codes, cats) for un in UNIT_NAMES}
+
+
+def convert_value_kg_to_unit(v_kg: float, unit_choice: str, factor: float | None = None) -> float:
+    if v_kg is None or (isinstance(v_kg, float) and not math.isfinite(v_kg)):
+        return math.nan
+    if factor is None:
+        factor = unit_ratio(UNITS, unit_choice)
+    return float(v_kg) * factor
+
+
+def fmt_dual_units(v_kg: float, sisir_factor: float | None = None) -> tuple[str, str]:
+    v_sisir = convert_value_kg_to_unit(v_kg, "Sisir", sisir_factor)
+    return f"{fmt_int(v_kg)} kg", f"{fmt_int(v_sisir)} sisir"
+
+
+def unit_column_labels(col: str) -> str:
+    # "Perkiraan_sisir" -> "Perkiraan (sisir)"; kolom lain tidak diubah
+    name, _, sfx = col.rpartition("_")
+    return f"{name} ({sfx})" if name and sfx in {unit_suffix(un) for un in UNIT_NAMES} else col
+
+
+def add_unit_columns(tbl: pd.DataFrame, factors: dict) -> pd.DataFrame:
+    # semua kolom kg x semua satuan dalam satu perkalian array (bukan .apply per sel)
+    kg_cols = [c for c in KG_COLS if c in tbl.columns]
+    units = [un for un in factors if un != BASE_UNIT]
+    if not kg_cols or not units:
+        return tbl.copy()
+    ratios = np.array([factors[un] for un in units], dtype=float)
+    conv = tbl[kg_cols].to_numpy(dtype=float)[:, None, :] * ratios[None, :, None]
+    names = [c.replace("_kg", f"_{unit_suffix(un)}") for un in units for c in kg_cols]
+    extra = pd.DataFrame(conv.reshape(len(tbl), -1), columns=names, index=tbl.index)
+    return pd.concat([tbl, extra], axis=1)
+
+
+def to_excel_bytes(df: pd.DataFrame, sheet_name="Data"):
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine="openpyxl") as writer:
+        df.to_excel(writer, index=False, sheet_name=sheet_name)
+    return output.getvalue()
+
+
+def make_line_month_chart(df_pred_year: pd.DataFrame, unit_choice: str, factor: float | None = None, level: str = "M"):
+    if df_pred_year is None or df_pred_year.empty:
+        return None
+
+    u = unit_suffix(unit_choice)
+    x_format, tip_title, tip_format = ("%b %Y", "Bulan", "%B %Y") if level == "M" else ("%d %b", "Minggu mulai", "%d %B %Y")
+
+    d = df_pred_year.copy()
+    d["bulan"] = d["tanggal"].dt.to_period("M").dt.to_timestamp() if level == "M" else d["tanggal"]
+    agg = d.groupby("bulan", as_index=False)["nilai"].mean().sort_values("bulan")
+    agg["nilai_u"] = agg["nilai"].to_numpy() * (unit_ratio(UNITS, unit_choice) if factor is None else factor)
+
+    base = alt.Chart(agg).encode(
+        x=alt.X("bulan:T", title="", axis=alt.Axis(format=x_format))
+    )
+
+    line = base.mark_line(strokeWidth=3).encode(
+        y=alt.Y("nilai_u:Q", title=u),
+        color=alt.value("#F6D25E"),
+        tooltip=[
+            alt.Tooltip("bulan:T", title=tip_title, format=tip_format),
+            alt.Tooltip("nilai_u:Q", title=f"Perkiraan ({u})", format=",.0f"),
+        ],
+    )
+
+    nearest = alt.selection_point(on="mouseover", fields=["bulan"], nearest=True, empty=False)
+
+    points = base.mark_point(size=80, opacity=0).add_params(nearest)
+    highlight = (
+        base.mark_point(size=90)
+        .encode(y="nilai_u:Q", color=alt.value("#F6D25E"))
+        .transform_filter(nearest)
+    )
+    rule = base.mark_rule(color="#cdbf9b").encode(x="bulan:T").transform_filter(nearest)
+    text = (
+        base.mark_text(align="left", dx=10, dy=-10)
+        .encode(
+            y="nilai_u:Q",
+            text=alt.Text("nilai_u:Q", format=",.0f"),
+            color=alt.value("#2A241C"),
+        )
+        .transform_filter(nearest)
+    )
+
+    chart = (
+        alt.layer(line, points, highlight, rule, text)
+        .properties(height=420)
+        .configure_view(stroke=None)
+        .configure_axis(
+            gridColor="#efe6d7",
+            tickColor="#efe6d7",
+            domainColor="#efe6d7",
+            labelColor="#6f675c",
+            titleColor="#6f675c",
+        )
+    )
+    return chart
+
+
+def make_bar_month_chart(df_pred_year: pd.DataFrame, unit_choice: str, factor: float | None = None):
+    if df_pred_year is None or df_pred_year.empty:
+        return None
+
+    u = unit_suffix(unit_choice)
+
+    d = df_pred_year.copy()
+    d["bulan"] = d["tanggal"].dt.month
+    d["bulan_nama"] = d["bulan"].apply(month_name_id)
+    agg = d.groupby(["bulan", "bulan_nama"], as_index=False)["nilai"].mean().sort_values("bulan")
+    agg["nilai_u"] = agg["nilai"].to_numpy() * (unit_ratio(UNITS, unit_choice) if factor is None else factor)
+
+    chart = (
+        alt.Chart(agg)
+        .mark_bar(cornerRadiusTopLeft=6, cornerRadiusTopRight=6)
+        .encode(
+            x=alt.X("bulan_nama:N", title="", sort=list(ID_MONTH_NAMES.values())),
+            y=alt.Y("nilai_u:Q", title=u),
+            tooltip=[
+                alt.Tooltip("bulan_nama:N", title="Bulan"),
+                alt.Tooltip("nilai_u:Q", title=f"Perkiraan ({u})", format=",.0f"),
+            ],
+            color=alt.value("#F6D25E"),
+        )
+        .properties(height=360)
+        .configure_view(stroke=None)
+        .configure_axis(
+            gridColor="#efe6d7",
+            tickColor="#efe6d7",
+            domainColor="#efe6d7",
+            labelColor="#6f675c",
+            titleColor="#6f675c",
+        )
+    )
+    return chart
+
+
+def make_rolling_accuracy_chart(df_rolling: pd.DataFrame):
+    if df_rolling is None or df_rolling.empty:
+        return None
+
+    chart = (
+        alt.Chart(df_rolling)
+        .mark_line(strokeWidth=3, point=True)
+        .encode(
+            x=alt.X("bulan:T", title="", axis=alt.Axis(format="%b %Y")),
+            y=alt.Y("MAPE_%:Q", title="MAPE (%)"),
+            color=alt.value("#F6D25E"),
+            tooltip=[
+                alt.Tooltip("bulan:T", title="Sampai bulan", format="%B %Y"),
+                alt.Tooltip("Jumlah_bulan:Q", title="Bulan berdata"),
+                alt.Tooltip("MAPE_%:Q", title="MAPE (%)", format=",.1f"),
+                alt.Tooltip("Bias_kg:Q", title="Bias (kg)", format=",.0f"),
+            ],
+        )
+        .properties(height=260)
+        .configure_view(stroke=None)
+        .configure_axis(
+            gridColor="#efe6d7",
+            tickColor="#efe6d7",
+            domainColor="#efe6d7",
+            labelColor="#6f675c",
+            titleColor="#6f675c",
+        )
+    )
+    return chart
+
+
+def month_table(df_pred_month: pd.DataFrame, year: int):
+    # input = rollup bulanan (satu baris per bulan, sudah dijumlah dari data harian/mingguan)
+    d = df_pred_month[df_pred_month["tanggal"].dt.year == year].sort_values("tanggal")
+    if d.empty:
+        return d
+
+    out = pd.DataFrame({
+        "Bulan": d["tanggal"].dt.month.map(month_name_id).to_numpy(),
+        "Perkiraan_kg": d["nilai"].to_numpy(),
+        "Min_kg": d["min"].to_numpy(),
+        "Maks_kg": d["max"].to_numpy(),
+    })
+
+    if "Min_kg" in out.columns and out["Min_kg"].isna().all():
+        out = out.drop(columns=["Min_kg"])
+    if "Maks_kg" in out.columns and out["Maks_kg"].isna().all():
+        out = out.drop(columns=["Maks_kg"])
+
+    return out
+
+
+def week_table(df_pred_week: pd.DataFrame, year: int):
+    d = df_pred_week[df_pred_week["tanggal"].dt.year == year].sort_values("tanggal")
+    if d.empty:
+        return d
+
+    out = pd.DataFrame({
+        "Minggu_mulai": d["tanggal"].dt.strftime("%d-%m-%Y").to_numpy(),
+        "Perkiraan_kg": d["nilai"].to_numpy(),
+        "Min_kg": d["min"].to_numpy(),
+        "Maks_kg": d["max"].to_numpy(),
+    })
+    return out.dropna(axis=1, how="all")
+
+
+def apply_what_if(agg: pd.DataFrame, global_pct: float, month_pct: float, months: list[int]) -> pd.DataFrame:
+    factor = (1 + global_pct / 100) * np.where(
+        np.isin(agg["bulan"].to_numpy(), months), 1 + month_pct / 100, 1.0
+    )
+    out = agg.copy()
+    for col in ["nilai", "min", "max"]:
+        out[f"{col}_skenario"] = out[col].to_numpy() * factor
+    return out
+
+
+def make_what_if_chart(df_what_if: pd.DataFrame, unit_choice: str, factor: float | None = None):
+    if df_what_if is None or df_what_if.empty:
+        return None
+
+    u = unit_suffix(unit_choice)
+    k = unit_ratio(UNITS, unit_choice) if factor is None else factor
+
+    long = pd.DataFrame({
+        "bulan_nama": np.tile(df_what_if["bulan_nama"].to_numpy(), 2),
+        "nilai_u": np.concatenate([df_what_if["nilai"].to_numpy(), df_what_if["nilai_skenario"].to_numpy()]) * k,
+        "versi": np.repeat(["Perkiraan", "Skenario"], len(df_what_if)),
+    })
+
+    chart = (
+        alt.Chart(long)
+        .mark_line(strokeWidth=3, point=True)
+        .encode(
+            x=alt.X("bulan_nama:N", title="", sort=list(ID_MONTH_NAMES.values())),
+            y=alt.Y("nilai_u:Q", title=u),
+            color=alt.Color(
+                "versi:N", title="",
+                scale=alt.Scale(domain=["Perkiraan", "Skenario"], range=["#cdbf9b", "#F6D25E"]),
+            ),
+            tooltip=[
+                alt.Tooltip("bulan_nama:N", title="Bulan"),
+                alt.Tooltip("versi:N", title=""),
+                alt.Tooltip("nilai_u:Q", title=u, format=",.0f"),
+            ],
+        )
+        .properties(height=320)
+        .configure_view(stroke=None)
+        .configure_axis(
+            gridColor="#efe6d7",
+            tickColor="#efe6d7",
+            domainColor="#efe6d7",
+            labelColor="#6f675c",
+            titleColor="#6f675c",
+        )
+    )
+    return chart
+
+
+def make_year_overlay_chart(df_long: pd.DataFrame, unit_choice: str):
+    if df_long is None or df_long.empty:
+        return None
+
+    u = unit_suffix(unit_choice)
+    chart = (
+        alt.Chart(df_long)
+        .mark_line(strokeWidth=3, point=True)
+        .encode(
+            x=alt.X("bulan_nama:N", title="", sort=list(ID_MONTH_NAMES.values())),
+            y=alt.Y("nilai_u:Q", title=u),
+            color=alt.Color("tahun:N", title="Tahun", scale=alt.Scale(scheme="goldorange")),
+            tooltip=[
+                alt.Tooltip("tahun:N", title="Tahun"),
+                alt.Tooltip("bulan_nama:N", title="Bulan"),
+                alt.Tooltip("nilai_u:Q", title=u, format=",.0f"),
+                alt.Tooltip("tumbuh:Q", title="Naik/turun vs tahun sebelumnya (%)", format="+,.1f"),
+            ],
+        )
+        .properties(height=380)
+        .configure_view(stroke=None)
+        .configure_axis(
+            gridColor="#efe6d7",
+            tickColor="#efe6d7",
+            domainColor="#efe6d7",
+            labelColor="#6f675c",
+            titleColor="#6f675c",
+        )
+    )
+    return chart
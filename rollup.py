@@ -0,0 +1,137 @@
+"""Rollup harian -> mingguan -> bulanan -> tahunan, dihitung sekali per versi dataset.
+
+Aturan agregasi dibuat eksplisit:
+- baris ganda di periode asli yang sama (mis. dua kolom aktual) -> dirata-rata (DUPLICATE_AGG)
+- naik ke periode yang lebih kasar -> dijumlah (ROLLUP_AGG), karena kebutuhan pisang adalah jumlah
+- rentang min/maks ikut naik sebagai akar jumlah kuadrat lebar (periode dianggap independen), dan
+  hanya kalau semua periode di dalamnya punya rentang; jumlah batas harian bukan interval bulanan
+
+Hasil tiap level berbentuk sama dengan data tidy (tanggal = awal periode, jenis, seri, nilai, min, max),
+jadi chart/tabel yang ada bisa langsung memakainya.
+"""
+import numpy as np
+import pandas as pd
+
+LEVELS = ("D", "W", "M", "Y")
+LEVEL_LABELS = {"D": "Harian", "W": "Mingguan", "M": "Bulanan", "Y": "Tahunan"}
+VALUE_COLS = ("nilai", "min", "max")
+
+DUPLICATE_AGG = "mean"
+ROLLUP_AGG = {"nilai": "sum", "min": "rss", "max": "rss"}
+
+# sumber tiap level: minggu & bulan dari data asli (minggu bisa melewati batas bulan), tahun dari bulan
+ROLLUP_SOURCE = {"W": "base", "M": "base", "Y": "M"}
+
+
+def detect_granularity(tanggal: pd.Series) -> str:
+    days = np.unique(tanggal.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]"))
+    if len(days) < 2:
+        return "M"
+    step = float(np.median(np.diff(days).astype(np.int64)))
+    if step <= 1.5:
+        return "D"
+    if step <= 8:
+        return "W"
+    if step <= 32:
+        return "M"
+    return "Y"
+
+
+def period_start(tanggal: np.ndarray, level: str) -> np.ndarray:
+    t = np.asarray(tanggal, dtype="datetime64[ns]")
+    if level == "D":
+        return t.astype("datetime64[D]").astype("datetime64[ns]")
+    if level == "W":
+        # minggu mulai Senin; 1970-01-01 adalah Kamis
+        days = t.astype("datetime64[D]").astype(np.int64)
+        return (days - (days + 3) % 7).astype("datetime64[D]").astype("datetime64[ns]")
+    if level == "M":
+        return t.astype("datetime64[M]").astype("datetime64[ns]")
+    if level == "Y":
+        return t.astype("datetime64[Y]").astype("datetime64[ns]")
+    raise ValueError(f"Level rollup tidak dikenal: {level}")
+
+
+def _aggregate(df: pd.DataFrame, level: str, how: dict) -> pd.DataFrame:
+    if df.empty:
+        return df.copy()
+
+    # indeks hari (bukan nanodetik) supaya kunci gabungan tidak overflow int64
+    periods = period_start(df["tanggal"].to_numpy(), level).astype("datetime64[D]").astype(np.int64)
+    jenis_codes, jenis_uniq = pd.factorize(df["jenis"], sort=True)
+    seri = df["seri"].astype("category") if "seri" in df.columns else pd.Series(pd.Categorical(["-"] * len(df)))
+    seri_codes = seri.cat.codes.to_numpy(dtype=np.int64)
+    seri_cats = seri.cat.categories
+
+    # satu kunci int64 per (periode, jenis, seri) -> group-by via bincount
+    n_seri = max(len(seri_cats), 1)
+    group = jenis_codes.astype(np.int64) * n_seri + seri_codes
+    key = periods * (len(jenis_uniq) * n_seri) + group
+    uniq, inv = np.unique(key, return_inverse=True)
+
+    out = {}
+    size = np.bincount(inv, minlength=len(uniq))
+    nilai = df["nilai"].to_numpy(dtype=float)
+    for col in VALUE_COLS:
+        v = df[col].to_numpy(dtype=float)
+        if how[col] == "rss":
+            # lebar rentang terhadap nilai, dijumlah kuadrat lalu diakar di sekitar total nilai
+            v = (nilai - v) ** 2 if col == "min" else (v - nilai) ** 2
+        ok = ~np.isnan(v)
+        s = np.bincount(inv, weights=np.where(ok, v, 0.0), minlength=len(uniq))
+        n = np.bincount(inv, weights=ok.astype(float), minlength=len(uniq))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if how[col] == "rss":
+                out[col] = np.where(n == size, np.sqrt(s), np.nan)
+            else:
+                out[col] = np.where(n > 0, s / n if how[col] == "mean" else s, np.nan)
+    for col in ("min", "max"):
+        if how[col] == "rss":
+            out[col] = out["nilai"] - out[col] if col == "min" else out["nilai"] + out[col]
+
+    g = uniq % (len(jenis_uniq) * n_seri)
+    res = pd.DataFrame({
+        "tanggal": (uniq // (len(jenis_uniq) * n_seri)).astype("datetime64[D]").astype("datetime64[ns]"),
+        "jenis": np.asarray(jenis_uniq)[g // n_seri],
+        "seri": pd.Categorical.from_codes(g % n_seri, categories=seri_cats),
+        **out,
+        "n": size,
+    })
+    if "seri" not in df.columns:
+        res = res.drop(columns=["seri"])
+    return res.sort_values(["tanggal", "jenis"], kind="stable").reset_index(drop=True)
+
+
+def build_rollups(tidy: pd.DataFrame, rollup_agg: dict | None = None) -> dict:
+    how_up = dict(ROLLUP_AGG, **(rollup_agg or {}))
+    native = detect_granularity(tidy["tanggal"]) if not tidy.empty else "M"
+
+    # data lebih kasar dari bulanan (dua-bulanan, kuartalan, ...) tetap punya level "M": tiap titik masuk
+    # ke bulannya sendiri, karena halaman app dan laporan statis selalu membaca rollups["M"]
+    base_level = native if LEVELS.index(native) <= LEVELS.index("M") else "M"
+    rollups = {"native": native}
+    base = _aggregate(tidy, base_level, {c: DUPLICATE_AGG for c in VALUE_COLS})
+    rollups[base_level] = base
+    for level in LEVELS[LEVELS.index(base_level) + 1:]:
+        source = base if ROLLUP_SOURCE[level] == "base" else rollups.get(ROLLUP_SOURCE[level], base)
+        rollups[level] = _aggregate(source.drop(columns=["n"]), level, how_up)
+    return rollups
+
+
+def year_month_matrix(df_month: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    # pivot tahun x bulan (12 kolom) dari rollup bulanan; sel kosong = NaN
+    if df_month.empty:
+        return np.array([], dtype=int), np.full((0, 12), np.nan)
+    years_all = df_month["tanggal"].dt.year.to_numpy()
+    years, yi = np.unique(years_all, return_inverse=True)
+    matrix = np.full((len(years), 12), np.nan)
+    matrix[yi, df_month["tanggal"].dt.month.to_numpy() - 1] = df_month["nilai"].to_numpy(dtype=float)
+    return years, matrix
+
+
+def growth_pct(matrix: np.ndarray) -> np.ndarray:
+    # pertumbuhan tiap baris terhadap baris sebelumnya (bulan yang sama), baris pertama NaN
+    growth = np.full_like(matrix, np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        growth[1:] = (matrix[1:] - matrix[:-1]) / matrix[:-1] * 100.0
+    return growth
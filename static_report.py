@@ -0,0 +1,274 @@
+"""Laporan statis (HTML) untuk pengunjung yang hanya melihat angka: tanpa sesi/websocket Streamlit.
+
+Satu halaman per tahun x satuan: kartu ringkasan, grafik bulanan, dan tabel rincian, untuk gabungan
+semua produk/outlet. Tiap tahun dirender paralel di proses terpisah (spec Altair = kerja Python murni).
+Situs hanya dibangun ulang kalau versi dataset (`dataset_version`) berbeda dari manifest.json.
+
+    python -m static_report build [--file data.xlsx] [--out site] [--workers N] [--force]
+    python -m static_report serve [--out site] [--port 8000]
+
+Dari app: set PISANG_STATIC_DIR=/path/site, situs dibangun di latar belakang setiap versi data baru.
+Folder hasil bisa juga disajikan nginx/hosting statis apa pun. Grafik memuat vega-embed dari CDN.
+"""
+import argparse
+import html
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ingest import ALL_SERIES, dataset_version, parse_excel, series_options, series_view
+from report import (
+    UNIT_NAMES,
+    add_unit_columns,
+    fmt_int,
+    make_line_month_chart,
+    month_name_id,
+    month_table,
+    unit_column_labels,
+    unit_suffix,
+    view_unit_factors,
+)
+from rollup import build_rollups
+
+DEFAULT_DATA = Path(__file__).parent / "hasil_prediksi_sarima.xlsx"
+DEFAULT_OUT = Path(__file__).parent / "site"
+MANIFEST = "manifest.json"
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+PAGE_GLOB = "[0-9][0-9][0-9][0-9]-*.html"
+
+_LOG = logging.getLogger(__name__)
+
+VEGA_SCRIPTS = (
+    "https://cdn.jsdelivr.net/npm/vega@5",
+    "https://cdn.jsdelivr.net/npm/vega-lite@5",
+    "https://cdn.jsdelivr.net/npm/vega-embed@6",
+)
+
+PAGE_CSS = """
+body{margin:0;background:#FBF7EF;color:#1F1F1F;font-family:"Plus Jakarta Sans",system-ui,-apple-system,Segoe UI,Roboto,Arial,sans-serif;font-size:17px}
+main{max-width:1100px;margin:0 auto;padding:24px 20px 40px}
+h1,h2{letter-spacing:-0.02em}
+.muted{color:#6E665C}
+nav{display:flex;flex-wrap:wrap;gap:8px;margin:10px 0}
+nav a{padding:6px 12px;border:1px solid #EADFCB;border-radius:999px;background:#fff;color:#2a241c;text-decoration:none}
+nav a.on{background:#FFF1B8;border-color:#E0B84C;font-weight:700}
+.cards{display:grid;grid-template-columns:repeat(auto-fit,minmax(240px,1fr));gap:14px;margin:18px 0}
+.card{background:#fff;border:1px solid #EADFCB;border-radius:18px;padding:16px 18px}
+.card-title{color:#6E665C;font-weight:700}
+.card-value{font-size:2rem;font-weight:800;margin:6px 0}
+.card-sub{color:#7A736A}
+table{border-collapse:collapse;width:100%;background:#fff;border:1px solid #EADFCB;border-radius:12px}
+th,td{padding:8px 10px;border-bottom:1px solid #efe6d7;text-align:right}
+th:first-child,td:first-child{text-align:left}
+#chart{background:#fff;border:1px solid #EADFCB;border-radius:18px;padding:12px}
+"""
+
+
+def unit_slug(unit: str) -> str:
+    return unit_suffix(unit).lower().replace(" ", "-")
+
+
+def page_name(year: int, unit: str) -> str:
+    return f"{year}-{unit_slug(unit)}.html"
+
+
+def _card(title: str, value: str, sub: str = "") -> str:
+    return (f'<div class="card"><div class="card-title">{title}</div>'
+            f'<div class="card-value">{value}</div><div class="card-sub">{sub}</div></div>')
+
+
+def _nav(items) -> str:
+    return "<nav>" + "".join(
+        f'<a href="{href}"{" class=on" if on else ""}>{html.escape(str(label))}</a>' for label, href, on in items
+    ) + "</nav>"
+
+
+def render_year(year: int, df_pred_year: pd.DataFrame, factors: dict, years: list[int],
+                generated: str, version: str) -> dict:
+    # semua satuan untuk satu tahun -> {nama file: html}; dijalankan di proses pekerja
+    g = df_pred_year.groupby("tanggal")["nilai"].mean().sort_index()
+    total_kg = float(df_pred_year["nilai"].sum())
+    avg_kg = float(g.mean())
+    peak = g.idxmax()
+    tbl = add_unit_columns(month_table(df_pred_year, year), factors).rename(columns=unit_column_labels)
+    table_html = tbl.to_html(index=False, border=0, na_rep="—", float_format=lambda v: f"{v:,.0f}")
+
+    pages = {}
+    for unit in UNIT_NAMES:
+        k, u = factors[unit], unit_suffix(unit)
+        sub_kg = (lambda v: f"≈ {fmt_int(v)} kg") if unit != "Kg" else (lambda v: "")
+        cards = "".join([
+            _card("Total kebutuhan 1 tahun", f"{fmt_int(total_kg * k)} {u}", sub_kg(total_kg) or f"Tahun {year}"),
+            _card("Rata-rata per bulan", f"{fmt_int(avg_kg * k)} {u}", sub_kg(avg_kg) or "Sebagai patokan belanja"),
+            _card("Bulan kebutuhan tertinggi", month_name_id(peak.month), f"± {fmt_int(float(g.max()) * k)} {u}"),
+        ])
+        chart = make_line_month_chart(df_pred_year, unit, k)
+        # builder yang sama dengan app (sudah tervalidasi di sana); validasi jsonschema ~1/3 waktu render
+        spec = chart.to_json(indent=None, validate=False) if chart is not None else "null"
+        pages[page_name(year, unit)] = f"""<!doctype html>
+<html lang="id"><head><meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1">
+<title>Perkiraan kebutuhan pisang {year} ({u})</title><style>{PAGE_CSS}</style>
+{"".join(f'<script src="{src}"></script>' for src in VEGA_SCRIPTS)}
+</head><body><main>
+<h1>Perkiraan kebutuhan pisang {year}</h1>
+<div class="muted">{html.escape(ALL_SERIES)} · dalam {u} · data versi {version}, dibuat {generated}</div>
+{_nav((y, page_name(y, unit), y == year) for y in years)}
+{_nav((un, page_name(year, un), un == unit) for un in UNIT_NAMES)}
+<div class="cards">{cards}</div>
+<h2>Perkiraan kebutuhan per bulan</h2>
+<div id="chart"></div>
+<script>const spec = {spec}; if (spec) vegaEmbed("#chart", spec, {{actions: false}});</script>
+<h2>Tabel rincian per bulan</h2>
+{table_html}
+</main></body></html>
+"""
+    return pages
+
+
+def _write_atomic(path: Path, text: str):
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def site_version(out_dir) -> str | None:
+    try:
+        return json.loads((Path(out_dir) / MANIFEST).read_text(encoding="utf-8"))["version"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def build_site(tidy: pd.DataFrame, out_dir=DEFAULT_OUT, version: str | None = None,
+               workers: int = MAX_WORKERS, force: bool = False) -> bool:
+    # False = situs sudah sesuai versi dataset, tidak ada yang ditulis
+    version = version or dataset_version(tidy)
+    out_dir = Path(out_dir)
+    if not force and site_version(out_dir) == version:
+        return False
+
+    seri = series_options(tidy)[0]
+    _, _, df_pred = series_view(tidy, seri)
+    rollups = build_rollups(df_pred)
+    pred_month = rollups["M"]
+    years = [int(y) for y in np.unique(pred_month["tanggal"].dt.year.to_numpy())]
+    generated = datetime.now().strftime("%d-%m-%Y %H:%M")
+
+    df_pred_all = tidy[tidy["jenis"] == "Perkiraan"]
+    jobs = {
+        y: (pred_month[pred_month["tanggal"].dt.year == y], view_unit_factors(df_pred_all, seri, y))
+        for y in years
+    }
+    render = partial(render_year, years=years, generated=generated, version=version)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if workers > 1 and len(years) > 1:
+        # spawn: aman dipanggil dari thread server Streamlit (tanpa fork proses multi-thread)
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(workers, len(years)), mp_context=ctx) as pool:
+            futures = [pool.submit(render, y, d, f) for y, (d, f) in jobs.items()]
+            results = [fut.result() for fut in futures]
+    else:
+        results = [render(y, d, f) for y, (d, f) in jobs.items()]
+
+    for pages in results:
+        for name, text in pages.items():
+            _write_atomic(out_dir / name, text)
+
+    current_year = datetime.now().year
+    landing = current_year if current_year in years else (years[-1] if years else None)
+    links = "".join(
+        f"<li>{y}: " + " · ".join(f'<a href="{page_name(y, un)}">{unit_suffix(un)}</a>' for un in UNIT_NAMES) + "</li>"
+        for y in years
+    )
+    refresh = f'<meta http-equiv="refresh" content="0; url={page_name(landing, UNIT_NAMES[0])}">' if landing else ""
+    _write_atomic(out_dir / "index.html", f"""<!doctype html>
+<html lang="id"><head><meta charset="utf-8">{refresh}<title>Perkiraan kebutuhan pisang</title>
+<style>{PAGE_CSS}</style></head><body><main><h1>Perkiraan kebutuhan pisang</h1><ul>{links}</ul></main></body></html>
+""")
+    # manifest terakhir: versi baru baru "berlaku" setelah semua halaman tertulis
+    page_names = sorted(name for pages in results for name in pages)
+    _write_atomic(out_dir / MANIFEST, json.dumps({
+        "version": version, "generated": generated, "years": years, "units": UNIT_NAMES,
+        "pages": page_names,
+    }, indent=1))
+    # halaman tahun/satuan dari versi lama yang tidak ada lagi di manifest jangan tetap bisa dibuka
+    for stale in set(out_dir.glob(PAGE_GLOB)) - {out_dir / name for name in page_names}:
+        stale.unlink(missing_ok=True)
+    return True
+
+
+_building = set()
+_built = set()
+_failed = set()
+_building_lock = threading.Lock()
+
+
+def export_from_env(tidy: pd.DataFrame, version: str):
+    # dipanggil tiap rerun app; cepat keluar kalau PISANG_STATIC_DIR tidak di-set atau versi sudah dibangun.
+    # Versi yang gagal dibangun dicatat sekali dan tidak dicoba ulang sampai proses restart
+    out_dir = os.environ.get("PISANG_STATIC_DIR")
+    if not out_dir or (out_dir, version) in _built or (out_dir, version) in _failed:
+        return
+    with _building_lock:
+        if version in _building:
+            return
+        _building.add(version)
+
+    def run():
+        try:
+            build_site(tidy, out_dir, version)
+            _built.add((out_dir, version))
+        except Exception:
+            _failed.add((out_dir, version))
+            _LOG.exception("Laporan statis versi %s gagal dibangun di %s", version, out_dir)
+        finally:
+            with _building_lock:
+                _building.discard(version)
+
+    threading.Thread(target=run, name="pisang-static", daemon=True).start()
+
+
+def serve(out_dir=DEFAULT_OUT, port: int = 8000, addr: str = "0.0.0.0"):
+    handler = partial(SimpleHTTPRequestHandler, directory=str(out_dir))
+    with ThreadingHTTPServer((addr, int(port)), handler) as httpd:
+        print(f"Menyajikan {out_dir} di http://{addr}:{port}/")
+        httpd.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Laporan statis perkiraan kebutuhan pisang.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="bangun situs (hanya kalau versi data berubah)")
+    b.add_argument("--file", default=str(DEFAULT_DATA), help="file prediksi (.xlsx/.xls/.ods/.csv)")
+    b.add_argument("--out", default=str(DEFAULT_OUT))
+    b.add_argument("--workers", type=int, default=MAX_WORKERS)
+    b.add_argument("--force", action="store_true", help="bangun ulang walau versi sama")
+    s = sub.add_parser("serve", help="sajikan folder situs lewat HTTP")
+    s.add_argument("--out", default=str(DEFAULT_OUT))
+    s.add_argument("--port", type=int, default=8000)
+    s.add_argument("--addr", default="0.0.0.0")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "serve":
+        serve(args.out, args.port, args.addr)
+        return
+
+    tidy = parse_excel(args.file, source="static")[0]
+    version = dataset_version(tidy)
+    if build_site(tidy, args.out, version, args.workers, args.force):
+        print(f"Situs versi {version} ditulis ke {args.out}")
+    else:
+        print(f"Situs di {args.out} sudah versi {version}; tidak ada yang dibangun ulang (pakai --force).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rollup import build_rollups
+
+
+def _tidy(dates) -> pd.DataFrame:
+    n = len(dates)
+    return pd.DataFrame({
+        "tanggal": pd.DatetimeIndex(dates),
+        "jenis": "Perkiraan",
+        "seri": pd.Categorical(["Utama"] * n),
+        "nilai": np.full(n, 10.0),
+        "min": np.full(n, 8.0),
+        "max": np.full(n, 12.0),
+    })
+
+
+@pytest.mark.parametrize("freq, native, levels", [
+    ("D", "D", {"D", "W", "M", "Y"}),
+    ("MS", "M", {"M", "Y"}),
+    ("2MS", "Y", {"M", "Y"}),
+    ("QS", "Y", {"M", "Y"}),
+])
+def test_monthly_level_always_present(freq, native, levels):
+    tidy = _tidy(pd.date_range("2024-01-01", "2025-12-31", freq=freq))
+    rollups = build_rollups(tidy)
+
+    assert rollups["native"] == native
+    assert set(rollups) - {"native"} == levels
+    month = rollups["M"]
+    assert month["tanggal"].dt.day.eq(1).all()
+    assert np.isclose(month["nilai"].sum(), tidy["nilai"].sum())
+    assert np.isclose(rollups["Y"]["nilai"].sum(), tidy["nilai"].sum())
+
+
+def test_coarse_points_keep_their_own_month():
+    tidy = _tidy(pd.date_range("2024-01-01", periods=8, freq="QS"))
+    month = build_rollups(tidy)["M"]
+
+    assert month["tanggal"].tolist() == tidy["tanggal"].tolist()
+    assert np.allclose(month["nilai"], 10.0)
+    assert np.allclose(month[["min", "max"]], tidy[["min", "max"]])
+
+
+def test_daily_bands_roll_up_as_root_sum_of_squares():
+    tidy = _tidy(pd.date_range("2025-01-01", "2025-01-31", freq="D"))
+    month = build_rollups(tidy)["M"].iloc[0]
+
+    assert np.isclose(month["nilai"], 310.0)
+    assert np.isclose(month["max"] - month["nilai"], 2.0 * np.sqrt(31))
+
+
+def test_incomplete_daily_bands_give_no_monthly_band():
+    tidy = _tidy(pd.date_range("2025-01-01", "2025-01-31", freq="D"))
+    tidy.loc[5, "min"] = np.nan
+    month = build_rollups(tidy)["M"].iloc[0]
+
+    assert np.isnan(month["min"])
+    assert np.isfinite(month["max"])
@@ -0,0 +1,41 @@
+import numpy as np
+
+from simulation import procurement_plan
+
+MEAN = np.full(12, 500.0)
+LOWER = MEAN * 0.8
+UPPER = MEAN * 1.2
+
+
+def test_same_seed_same_plan():
+    a = procurement_plan(MEAN, LOWER, UPPER, seed=7)
+    b = procurement_plan(MEAN, LOWER, UPPER, seed=7)
+    assert a.equals(b)
+
+
+def test_stock_is_carried_forward_not_credited_every_month():
+    base = procurement_plan(MEAN, LOWER, UPPER, stock_on_hand=0.0)
+    with_stock = procurement_plan(MEAN, LOWER, UPPER, stock_on_hand=100.0)
+
+    saved = base["Saran_beli_kg"] - with_stock["Saran_beli_kg"]
+    assert np.isclose(saved.sum(), 100.0)
+    assert np.isclose(saved.iloc[0], 100.0)
+    assert np.allclose(saved.iloc[1:], 0.0)
+
+
+def test_large_stock_covers_first_months_then_runs_out():
+    base = procurement_plan(MEAN, LOWER, UPPER)
+    need = base["Saran_beli_kg"].to_numpy()
+    stock = need[:2].sum() + 50.0
+    plan = procurement_plan(MEAN, LOWER, UPPER, stock_on_hand=stock)
+
+    assert np.allclose(plan["Saran_beli_kg"].iloc[:2], 0.0)
+    assert np.isclose(plan["Saran_beli_kg"].iloc[2], need[2] - 50.0)
+    assert np.allclose(plan["Saran_beli_kg"].iloc[3:], need[3:])
+    assert np.isclose(plan["Pakai_stok_kg"].sum(), stock)
+
+
+def test_stockout_after_following_plan_matches_service_level():
+    plan = procurement_plan(MEAN, LOWER, UPPER, service_level=0.9, stock_on_hand=300.0, n_sims=20000)
+    assert np.allclose(plan["Peluang_kehabisan_saran_%"], 10.0, atol=1.0)
+    assert (plan["Cadangan_kg"] > 0).all()
@@ -0,0 +1,65 @@
+"""Registry satuan: berapa <satuan> per 1 kg, boleh beda per varietas (seri).
+
+Bawaan: patokan UMKM 450 sisir = 250 kg, dan 1 tandan ± 12 kg. Angka bisa diganti lewat
+file JSON (lihat `load_unit_registry`), contoh:
+
+    {"Sisir": {"per_kg": 1.8, "varietas": {"Kepok": 1.6, "Raja": 2.0}},
+     "Tandan": {"suffix": "tandan", "per_kg": 0.0833}}
+
+Konversi selalu per array (satu perkalian NumPy), tidak per baris.
+"""
+import copy
+import json
+from pathlib import Path
+
+import numpy as np
+
+BASE_UNIT = "Kg"
+
+DEFAULT_UNITS = {
+    "Kg": {"suffix": "kg", "per_kg": 1.0, "varietas": {}},
+    "Sisir": {"suffix": "sisir", "per_kg": 450 / 250, "varietas": {}},
+    "Tandan": {"suffix": "tandan", "per_kg": 1 / 12, "varietas": {}},
+}
+
+
+def load_unit_registry(path=None) -> dict:
+    registry = copy.deepcopy(DEFAULT_UNITS)
+    if path is None or not Path(path).exists():
+        return registry
+
+    config = json.loads(Path(path).read_text(encoding="utf-8"))
+    for unit, spec in config.items():
+        entry = registry.setdefault(unit, {"suffix": unit.lower(), "per_kg": 1.0, "varietas": {}})
+        entry["suffix"] = spec.get("suffix", entry["suffix"])
+        entry["per_kg"] = float(spec.get("per_kg", entry["per_kg"]))
+        entry["varietas"].update({str(k): float(v) for k, v in spec.get("varietas", {}).items()})
+    registry[BASE_UNIT].update({"per_kg": 1.0, "varietas": {}})
+    return registry
+
+
+def unit_names(registry: dict) -> list[str]:
+    return list(registry)
+
+
+def unit_ratio(registry: dict, unit: str, variety: str | None = None) -> float:
+    entry = registry.get(unit, registry[BASE_UNIT])
+    return entry["varietas"].get(variety, entry["per_kg"])
+
+
+def unit_ratios(registry: dict, unit: str, varieties) -> np.ndarray:
+    # satu rasio per kategori seri; diindeks dengan kode kategori
+    return np.array([unit_ratio(registry, unit, v) for v in varieties], dtype=float)
+
+
+def convert_kg_coded(values_kg, codes, varieties, unit: str, registry: dict) -> np.ndarray:
+    return np.asarray(values_kg, dtype=float) * unit_ratios(registry, unit, varieties)[np.asarray(codes)]
+
+
+def weighted_ratio(registry: dict, unit: str, values_kg, codes, varieties) -> float:
+    # rasio gabungan beberapa varietas = rata-rata rasio berbobot kg
+    values_kg = np.asarray(values_kg, dtype=float)
+    total = np.nansum(values_kg)
+    if not total:
+        return unit_ratio(registry, unit)
+    return float(np.nansum(convert_kg_coded(values_kg, codes, varieties, unit, registry)) / total)